@@ -0,0 +1,49 @@
+import sys
+from itertools import cycle, islice
+from timeit import default_timer as timer
+from typing import Iterator
+
+from before import count_fruits
+from streaming import count_fruits_streaming
+
+FRUITS = ["apple", "banana", "cherry", "durian", "elderberry", "fig", "grape"]
+DEFAULT_SIZES = [1_000_000]
+# Above this size the list based implementation needs more memory than most machines have.
+LIST_LIMIT = 100_000_000
+
+
+def generate_fruits(size: int) -> Iterator[str]:
+    return islice(cycle(FRUITS), size)
+
+
+def report(size: int, label: str, seconds: float | None) -> None:
+    timing = "skipped" if seconds is None else f"{seconds:.2f}s"
+    print(f"{size:>13,} items  {label:<34}{timing:>10}")
+
+
+def benchmark(size: int, workers: int) -> None:
+    seconds = None
+    if size <= LIST_LIMIT:
+        start = timer()
+        count_fruits(list(generate_fruits(size)))
+        seconds = timer() - start
+    report(size, "count_fruits", seconds)
+
+    start = timer()
+    count_fruits_streaming(generate_fruits(size))
+    report(size, "count_fruits_streaming", timer() - start)
+
+    start = timer()
+    count_fruits_streaming(generate_fruits(size), workers=workers)
+    report(size, f"count_fruits_streaming ({workers} workers)", timer() - start)
+
+
+def main() -> None:
+    # usage: python benchmark.py [size ...], e.g. 1000000 100000000 1000000000
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size, workers=4)
+
+
+if __name__ == "__main__":
+    main()
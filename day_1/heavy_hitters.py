@@ -0,0 +1,108 @@
+import math
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import partial, reduce
+from typing import Iterable
+
+from streaming import (
+    DEFAULT_CHUNK_SIZE,
+    FruitSource,
+    chunked,
+    map_chunks,
+    read_fruits,
+)
+
+
+@dataclass
+class FrequentFruits:
+    """Misra-Gries summary that keeps at most `capacity` counters.
+
+    Every kept count is a lower bound of the true count and undercounts by at most
+    `error`, which never exceeds total / (capacity + 1). Fruits that were dropped
+    occurred at most `error` times. Summaries of different shards can be merged
+    without losing these guarantees.
+    """
+
+    capacity: int
+    counts: dict[str, int] = field(default_factory=dict)
+    error: int = 0
+    total: int = 0
+
+    @classmethod
+    def with_error_bound(cls, epsilon: float) -> "FrequentFruits":
+        """Creates a summary whose counts are off by at most epsilon * total."""
+        if not 0 < epsilon < 1:
+            raise ValueError(f"Invalid error bound: {epsilon}")
+        return cls(capacity=math.ceil(1 / epsilon))
+
+    def update(self, fruits: Iterable[str]) -> None:
+        # Let the dict grow to twice the capacity so pruning is amortized over many updates.
+        for fruit, count in Counter(fruits).items():
+            self.counts[fruit] = self.counts.get(fruit, 0) + count
+            self.total += count
+            if len(self.counts) > 2 * self.capacity:
+                self._prune()
+        if len(self.counts) > self.capacity:
+            self._prune()
+
+    def merge(self, other: "FrequentFruits") -> "FrequentFruits":
+        if other.capacity != self.capacity:
+            raise ValueError("Can only merge summaries with the same capacity.")
+        merged = FrequentFruits(
+            capacity=self.capacity,
+            counts=dict(Counter(self.counts) + Counter(other.counts)),
+            error=self.error + other.error,
+            total=self.total + other.total,
+        )
+        if len(merged.counts) > merged.capacity:
+            merged._prune()
+        return merged
+
+    def top(self, k: int) -> dict[str, int]:
+        return dict(Counter(self.counts).most_common(k))
+
+    def _prune(self) -> None:
+        # Subtracting the (capacity + 1)-th largest count removes at least
+        # capacity + 1 times that amount from the summary, which bounds the error.
+        cut = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = {
+            fruit: count - cut for fruit, count in self.counts.items() if count > cut
+        }
+        self.error += cut
+
+
+def summarize_chunk(chunk: list[str], capacity: int) -> FrequentFruits:
+    summary = FrequentFruits(capacity=capacity)
+    summary.update(chunk)
+    return summary
+
+
+def count_fruits_approximate(
+    source: FruitSource,
+    top_k: int = 10,
+    epsilon: float = 0.001,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+) -> tuple[dict[str, int], int]:
+    """Approximately counts the top_k most frequent fruits in fixed memory.
+
+    Returns the heavy hitters in the same shape as count_fruits, together with the
+    maximum undercount of every returned count (at most epsilon * number of fruits).
+    The true count of each fruit lies in [count, count + error].
+    """
+    empty = FrequentFruits.with_error_bound(epsilon)
+    fruits = read_fruits(source) if isinstance(source, (str, os.PathLike)) else source
+
+    if workers is None or workers <= 1:
+        summary = empty
+        for chunk in chunked(fruits, chunk_size):
+            summary.update(chunk)
+    else:
+        summarize = partial(summarize_chunk, capacity=empty.capacity)
+        summary = reduce(
+            FrequentFruits.merge,
+            map_chunks(summarize, fruits, chunk_size, workers),
+            empty,
+        )
+    return summary.top(top_k), summary.error
@@ -0,0 +1,112 @@
+import os
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TypeVar
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+R = TypeVar("R")
+
+FruitSource = Iterable[str] | str | os.PathLike[str]
+
+
+def read_fruits(path: str | os.PathLike[str]) -> Iterator[str]:
+    """Yields whitespace separated fruits from a text file, one line at a time."""
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            yield from line.split()
+
+
+def chunked(fruits: Iterable[str], size: int) -> Iterator[list[str]]:
+    iterator = iter(fruits)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def count_chunk(chunk: list[str]) -> Counter[str]:
+    return Counter(chunk)
+
+
+def count_file_range(path: str | os.PathLike[str], start: int, end: int) -> Counter[str]:
+    """Counts the fruits on every line that starts within [start, end) of the file."""
+    counts: Counter[bytes] = Counter()
+    with open(path, "rb") as file:
+        position = start
+        if start > 0:
+            # The line crossing the boundary belongs to the previous shard.
+            file.seek(start - 1)
+            position += len(file.readline()) - 1
+        while position < end:
+            line = file.readline()
+            if not line:
+                break
+            position += len(line)
+            counts.update(line.split())
+    return Counter({fruit.decode("utf-8"): total for fruit, total in counts.items()})
+
+
+def _count_file_sharded(path: str | os.PathLike[str], workers: int) -> Counter[str]:
+    size = os.path.getsize(path)
+    shard_size = max(1, -(-size // workers))
+    total: Counter[str] = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(count_file_range, path, start, start + shard_size)
+            for start in range(0, size, shard_size)
+        ]
+        for future in futures:
+            total.update(future.result())
+    return total
+
+
+def map_chunks(
+    func: Callable[[list[str]], R],
+    fruits: Iterable[str],
+    chunk_size: int,
+    workers: int,
+) -> Iterator[R]:
+    """Runs func on chunks of fruits in a process pool and yields the results in order."""
+    # Only a bounded number of chunks is in flight, so memory doesn't grow with the input.
+    max_pending = workers * 2
+    pending: deque[Future[R]] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in chunked(fruits, chunk_size):
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _count_iterable_sharded(
+    fruits: Iterable[str], chunk_size: int, workers: int
+) -> Counter[str]:
+    total: Counter[str] = Counter()
+    for partial in map_chunks(count_chunk, fruits, chunk_size, workers):
+        total.update(partial)
+    return total
+
+
+def count_fruits_streaming(
+    source: FruitSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+) -> dict[str, int]:
+    """Counts fruits from any iterable, or from a file path, without materializing the input.
+
+    A str source is treated as a path to a text file with whitespace separated fruits.
+    When workers is given, the input is sharded across a process pool and the partial
+    counts are merged. Memory use is bounded by the number of distinct fruits plus
+    one chunk per pending worker task.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size: {chunk_size}")
+    if isinstance(source, (str, os.PathLike)):
+        if workers is None or workers <= 1:
+            return dict(Counter(read_fruits(source)))
+        return dict(_count_file_sharded(source, workers))
+
+    if workers is None or workers <= 1:
+        return dict(Counter(source))
+    return dict(_count_iterable_sharded(source, chunk_size, workers))
@@ -1,4 +1,6 @@
 from before import count_fruits
+from heavy_hitters import count_fruits_approximate
+from streaming import count_fruits_streaming
 
 
 def test_with_full_list():
@@ -21,3 +23,37 @@ def test_with_full_list():
 
 def test_with_empty_list():
     assert count_fruits([]) == {}
+
+
+def test_streaming_matches_count_fruits(tmp_path):
+    fruits = ["apple", "banana", "apple", "cherry"] * 1000
+    expected = count_fruits(fruits)
+
+    assert count_fruits_streaming(iter(fruits)) == expected
+    assert count_fruits_streaming(iter(fruits), chunk_size=7, workers=2) == expected
+
+    path = tmp_path / "fruits.txt"
+    path.write_text("\n".join(" ".join(fruits[i : i + 3]) for i in range(0, 4000, 3)))
+    assert count_fruits_streaming(path) == expected
+    assert count_fruits_streaming(str(path), workers=3) == expected
+
+
+def test_streaming_with_empty_input(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+    assert count_fruits_streaming([]) == {}
+    assert count_fruits_streaming(path, workers=2) == {}
+
+
+def test_approximate_counts_are_within_error_bound():
+    fruits = ["apple"] * 500 + ["banana"] * 300 + [f"fruit{i}" for i in range(1000)]
+    expected = count_fruits(fruits)
+
+    for workers in (None, 2):
+        top, error = count_fruits_approximate(
+            fruits, top_k=2, epsilon=0.01, chunk_size=100, workers=workers
+        )
+        assert list(top) == ["apple", "banana"]
+        assert error <= 0.01 * len(fruits)
+        for fruit, count in top.items():
+            assert count <= expected[fruit] <= count + error
@@ -1,8 +1,11 @@
-from typing import Any, Optional
+from dataclasses import dataclass
+from typing import Any, Optional, Protocol
 import os
 import requests
 from dotenv import load_dotenv
 
+from http_client import DEFAULT_TIMEOUT, SESSION
+
 
 class CityNotFoundError(Exception):
     pass
@@ -12,9 +15,17 @@ class WeatherServiceCreationError(Exception):
     pass
 
 
+class HTTPClient(Protocol):
+    def get(self, url: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        ...
+
+
+@dataclass
 class RequestsClient:
+    session: requests.Session = SESSION
+
     def get(self, url: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
-        return requests.get(url, params=params, timeout=5).json()
+        return self.session.get(url, params=params, timeout=DEFAULT_TIMEOUT).json()
 
 
 class WeatherService:
@@ -22,7 +33,7 @@ class WeatherService:
         self.api_key = api_key
         self.full_weather_forecast: dict[str, Any] = {}
 
-    def retrieve_forecast(self, city: str, request_client: RequestsClient) -> None:
+    def retrieve_forecast(self, city: str, request_client: HTTPClient) -> None:
         url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={self.api_key}"
         response = request_client.get(url)
         if "main" not in response:
@@ -1,8 +1,11 @@
+from dataclasses import dataclass
 from typing import Any, Protocol
 import os
 import requests
 from dotenv import load_dotenv
 
+from http_client import DEFAULT_TIMEOUT, SESSION
+
 
 class CityNotFoundError(Exception):
     pass
@@ -17,9 +20,12 @@ class HTTPClient(Protocol):
         ...
 
 
+@dataclass
 class RequestsClient:
+    session: requests.Session = SESSION
+
     def get(self, url: str) -> Any:
-        response = requests.get(url, timeout=5)
+        response = self.session.get(url, timeout=DEFAULT_TIMEOUT)
         response.raise_for_status()
         return response.json()
 
@@ -5,13 +5,15 @@ from functools import partial
 import requests
 from dotenv import load_dotenv
 
+from http_client import DEFAULT_TIMEOUT, SESSION
+
 
 class CityNotFoundError(Exception):
     pass
 
 
-def get(url: str) -> dict[str, Any]:
-    response = requests.get(url, timeout=5)
+def get(url: str, session: requests.Session = SESSION) -> dict[str, Any]:
+    response = session.get(url, timeout=DEFAULT_TIMEOUT)
     return response.json()
 
 
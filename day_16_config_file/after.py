@@ -4,6 +4,8 @@ from pathlib import Path
 import json
 import requests
 
+from http_client import DEFAULT_TIMEOUT, SESSION
+
 CONFIG_PATH = Path(__file__).parent / "config.json"
 HttpGet = Callable[[str], Any]
 ConfigLoader = Callable[[str | Path], dict[str, Any]]
@@ -18,8 +20,8 @@ def load_config(path: str | Path) -> dict[str, Any]:
         return json.load(file)
 
 
-def get(url: str) -> Any:
-    response = requests.get(url, timeout=5)
+def get(url: str, session: requests.Session = SESSION) -> Any:
+    response = session.get(url, timeout=DEFAULT_TIMEOUT)
     response.raise_for_status()  # Raise an exception if the request failed
     return response.json()
 
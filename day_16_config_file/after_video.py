@@ -1,7 +1,9 @@
 from typing import Any, Callable
 from functools import partial
 import requests
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+
+from http_client import DEFAULT_TIMEOUT, SESSION
 
 CONFIG_PATH = "config_video.json"
 HttpGet = Callable[[str], Any]
@@ -12,11 +14,14 @@ class CityNotFoundError(Exception):
 
 
 class UrlTemplateClient(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     template: str
+    session: requests.Session = Field(default=SESSION, exclude=True)
 
     def get(self, data: dict[str, Any]) -> dict[str, Any]:
         url = self.template.format(**data)
-        response = requests.get(url, timeout=5)
+        response = self.session.get(url, timeout=DEFAULT_TIMEOUT)
         response.raise_for_status()
         return response.json()
 
@@ -4,6 +4,8 @@ import requests
 import asyncio
 from timeit import timeit
 
+from http_client import DEFAULT_TIMEOUT, SESSION
+
 JSON = int | str | float | bool | None | dict[str, "JSON"] | list["JSON"]
 JSONObject = dict[str, JSON]
 JSONList = list[JSON]
@@ -15,24 +17,25 @@ API_KEY = ""
 @dataclass
 class UrlTemplateClient:
     template: str
+    session: requests.Session = SESSION
 
     async def get(self, data: dict[str, Any]) -> JSON:
         url = self.template.format(**data)
-        return await http_get(url)
+        return await http_get(url, self.session)
 
 
 class CityNotFoundError(Exception):
     pass
 
 
-def http_get_sync(url: str) -> JSON:
-    response = requests.get(url, timeout=5)
+def http_get_sync(url: str, session: requests.Session = SESSION) -> JSON:
+    response = session.get(url, timeout=DEFAULT_TIMEOUT)
     response.raise_for_status()  # Raise an exception if the request failed
     return response.json()
 
 
-async def http_get(url: str) -> JSON:
-    return await asyncio.to_thread(http_get_sync, url)
+async def http_get(url: str, session: requests.Session = SESSION) -> JSON:
+    return await asyncio.to_thread(http_get_sync, url, session)
 
 
 async def get_capital(country: str) -> str:
@@ -0,0 +1,41 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = 5  # seconds
+DEFAULT_POOL_SIZE = 10  # kept-alive connections per host
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.3  # retries wait 0.3 s, 0.6 s, 1.2 s, ...
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def create_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF,
+) -> requests.Session:
+    """Creates a session that keeps connections alive and retries failed GETs.
+
+    requests.get opens a new connection for every call; a session reuses them,
+    up to pool_size connections per host. Connection errors and the statuses in
+    RETRY_STATUSES are retried with exponential backoff, honoring Retry-After.
+    A session can be shared between threads, so size the pool for the number of
+    concurrent requests.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,  # return the last response, callers check it
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = create_session()
@@ -0,0 +1,120 @@
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import repeat
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from timeit import default_timer as timer
+from typing import Any
+
+import requests
+
+import weather
+from http_client import create_session
+from weather import HttpGetFn
+
+HOST = "127.0.0.1"
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+THREADS = 8
+FORECAST = json.dumps(
+    {"main": {"temp": 285.15, "humidity": 80}, "wind": {"speed": 4.1, "deg": 250}}
+).encode()
+
+
+class ForecastHandler(BaseHTTPRequestHandler):
+    """Answers every GET with the same forecast, over keep-alive connections.
+
+    With fail_every set, every nth request gets a 503, to exercise retries.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle's algorithm
+    # holds back the body on a kept-alive connection until the client's delayed ACK.
+    disable_nagle_algorithm = True
+    server: "ForecastServer"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        with self.server.lock:
+            self.server.requests += 1
+            fail = self.server.fail_every and (
+                self.server.requests % self.server.fail_every == 0
+            )
+        body = b"" if fail else FORECAST
+        self.send_response(503 if fail else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class ForecastServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fail_every: int = 0) -> None:
+        super().__init__((HOST, 0), ForecastHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.fail_every = fail_every
+
+    @property
+    def url(self) -> str:
+        return f"http://{HOST}:{self.server_port}/data/2.5/weather"
+
+    def reset(self) -> None:
+        self.connections = self.requests = 0
+
+
+def unpooled_get(url: str) -> dict[str, Any] | None:
+    # What every call path did before: a new connection per request.
+    response = requests.get(url, timeout=5)
+    return response.json() if response.status_code == 200 else None
+
+
+def run(
+    server: ForecastServer,
+    name: str,
+    http_get: HttpGetFn,
+    threads: int = 1,
+) -> None:
+    server.reset()
+    start = timer()
+    with ThreadPoolExecutor(threads) as executor:
+        forecasts = list(executor.map(http_get, repeat(server.url, REQUESTS)))
+    elapsed = timer() - start
+    assert all(forecast and "main" in forecast for forecast in forecasts)
+    print(
+        f"{name:<34}{REQUESTS / elapsed:>8,.0f} requests/s "
+        f"{server.connections:>6,} connections {server.requests:>6,} requests"
+    )
+
+
+def main() -> None:
+    server = ForecastServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"{REQUESTS:,} forecasts from a local server")
+
+    run(server, "requests.get", unpooled_get)
+    run(server, "pooled session", partial(weather.http_get, session=create_session()))
+    run(server, f"requests.get, {THREADS} threads", unpooled_get, THREADS)
+    pooled = partial(weather.http_get, session=create_session(pool_size=THREADS))
+    run(server, f"pooled session, {THREADS} threads", pooled, THREADS)
+
+    # Every 10th request fails once; the retries make every forecast succeed.
+    server.fail_every = 10
+    pooled = partial(weather.http_get, session=create_session(backoff_factor=0.001))
+    run(server, "pooled session, 10% 503s", pooled)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
 from typing import Any, Callable
 import requests
 
+from http_client import DEFAULT_TIMEOUT, SESSION
+
 HttpGetFn = Callable[[str], dict[str, Any] | None]
 
 
-def http_get(url: str) -> dict[str, Any] | None:
-    response = requests.get(url, timeout=5)
+def http_get(url: str, session: requests.Session = SESSION) -> dict[str, Any] | None:
+    response = session.get(url, timeout=DEFAULT_TIMEOUT)
     if response.status_code == 200:
         return response.json()
     return None
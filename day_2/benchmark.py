@@ -0,0 +1,48 @@
+from array import array
+from timeit import timeit
+from typing import Any, Callable
+
+import sol
+import vectorized
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def time_per_call(func: Callable[[Any], Any], data: Any) -> float:
+    number = max(1, 1_000_000 // len(data))
+    return timeit(lambda: func(data), number=number) / number
+
+
+def to_array(data: list[Any]) -> Any:
+    if vectorized.np is not None:
+        return vectorized.np.asarray(data)
+    return data if isinstance(data[0], str) else array("q", data)
+
+
+def main() -> None:
+    backend = "numpy" if vectorized.np is not None else "array"
+    print(f"Vectorized backend: {backend}")
+    print(
+        f"{'function':<20}{'size':>10}{'python':>12}{'from list':>12}{'from array':>12}"
+    )
+    for name in ["filter_odd_numbers", "square_numbers", "count"]:
+        python_func = getattr(sol, name)
+        vectorized_func = getattr(vectorized, name)
+        for size in SIZES:
+            if name == "count":
+                data: list[Any] = ["banana"[: i % 7] for i in range(size)]
+            else:
+                data = list(range(size))
+            timings = [
+                time_per_call(python_func, data),
+                time_per_call(lambda values: vectorized_func(values, threshold=0), data),
+                time_per_call(vectorized_func, to_array(data)),
+            ]
+            print(
+                f"{name:<20}{size:>10,}"
+                + "".join(f"{timing * 1e6:>10.1f}us" for timing in timings)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import Any, Literal, Optional, Sequence
+
+from sol import (
+    FilterFunc,
+    ProcessFunc,
+    count,
+    filter_odd_numbers,
+    process_data,
+    square_numbers,
+)
+
+# Chunks per worker, so a slow chunk doesn't leave the other workers idle.
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_SIZE = 1_000
+
+
+def auto_chunk_size(size: int, workers: int) -> int:
+    return max(MIN_CHUNK_SIZE, -(-size // (workers * CHUNKS_PER_WORKER)))
+
+
+def _process_chunk(
+    chunk: Sequence[Any],
+    filter_func: Optional[FilterFunc[Any]],
+    process_func: Optional[ProcessFunc[Any, Any]],
+) -> list[Any]:
+    return list(process_data(chunk, filter_func, process_func))  # type: ignore
+
+
+def process_data_parallel(
+    data: Sequence[Any],
+    filter_func: Optional[FilterFunc[Any]] = None,
+    process_func: Optional[ProcessFunc[Any, Any]] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    executor: Literal["process", "thread"] = "process",
+) -> list[Any]:
+    """Applies filter_func and process_func on chunks of a data sequence in parallel.
+
+    Both functions have to work item by item, like the helpers in sol.py, so that
+    processing the chunks separately gives the same result as processing the whole
+    sequence. Results are reassembled in input order. Use the process executor for
+    CPU-bound Python functions and the thread executor for functions that release
+    the GIL; with processes, the functions have to be picklable.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or auto_chunk_size(len(data), workers)
+    if workers == 1 or len(data) <= chunk_size:
+        return _process_chunk(data, filter_func, process_func)
+
+    chunks = (data[i : i + chunk_size] for i in range(0, len(data), chunk_size))
+    process_chunk = partial(
+        _process_chunk, filter_func=filter_func, process_func=process_func
+    )
+    pool: Executor = (
+        ProcessPoolExecutor(max_workers=workers)
+        if executor == "process"
+        else ThreadPoolExecutor(max_workers=workers)
+    )
+    with pool:
+        return list(chain.from_iterable(pool.map(process_chunk, chunks)))
+
+
+def main() -> None:
+    numbers = list(range(1, 1_000_001))
+
+    result = process_data_parallel(numbers, filter_odd_numbers, square_numbers)
+    print(result[:5], len(result))
+
+    words = ["apple", "banana", "cherry"] * 100_000
+    result2 = process_data_parallel(words, process_func=count, workers=2)
+    print(result2[:3], len(result2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from functools import reduce
+from typing import Any, Callable, Generic, Iterable, Iterator, Sized, TypeVar
+
+from sol import NumericType
+
+T = TypeVar("T")
+U = TypeVar("U")
+R = TypeVar("R")
+Stage = Callable[[Iterable[Any]], Iterable[Any]]
+
+
+def filter_odd_numbers_lazy(numbers: Iterable[int]) -> Iterator[int]:
+    """Lazily filters odd numbers from a sequence of numbers."""
+    return (num for num in numbers if num % 2 == 0)
+
+
+def square_numbers_lazy(numbers: Iterable[NumericType]) -> Iterator[NumericType]:
+    """Lazily squares numbers in a sequence."""
+    return (num**2 for num in numbers)
+
+
+def count_lazy(words: Iterable[Sized]) -> Iterator[int]:
+    """Lazily counts the number of characters in a sequence of words."""
+    return (len(word) for word in words)
+
+
+class Pipeline(Generic[T]):
+    """Chains stages lazily, so every item passes through all stages in a single pass.
+
+    Nothing is evaluated until the pipeline is iterated or collected, and no stage
+    builds an intermediate list.
+    """
+
+    def __init__(self, source: Iterable[T]) -> None:
+        self._source = source
+
+    def filter(self, predicate: Callable[[T], bool]) -> "Pipeline[T]":
+        return Pipeline(filter(predicate, self._source))
+
+    def map(self, func: Callable[[T], U]) -> "Pipeline[U]":
+        return Pipeline(map(func, self._source))
+
+    def then(self, stage: Callable[[Iterable[T]], Iterable[U]]) -> "Pipeline[U]":
+        return Pipeline(stage(self._source))
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._source)
+
+    def collect(self, sink: Callable[[Iterable[T]], R] = list) -> R:  # type: ignore
+        return sink(self._source)
+
+
+def process_stream(
+    data: Iterable[Any], *stages: Stage, sink: Callable[[Iterable[Any]], R] = list  # type: ignore
+) -> R:
+    """Applies any number of lazy stages on a data sequence and materializes at the sink."""
+    return reduce(Pipeline.then, stages, Pipeline(data)).collect(sink)
+
+
+def main() -> None:
+    numbers = range(1, 11)
+
+    result: list[int] = process_stream(
+        numbers, filter_odd_numbers_lazy, square_numbers_lazy
+    )
+    print(result)
+
+    words = ["apple", "banana", "cherry"]
+    result2: list[int] = process_stream(words, count_lazy)
+    print(result2)
+
+    total = (
+        Pipeline(range(1, 1_000_001))
+        .filter(lambda num: num % 3 == 0)
+        .then(filter_odd_numbers_lazy)
+        .then(square_numbers_lazy)
+        .map(str)
+        .then(count_lazy)
+        .collect(sum)
+    )
+    print(total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+from array import array
+from typing import Any, Iterable, Sized
+
+import sol
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, fall back to the array module
+    np = None  # type: ignore[assignment]
+
+# Minimum list length at which converting to a numpy array pays off, see benchmark.py.
+# None means converting never pays off, so only array inputs are vectorized.
+FILTER_THRESHOLD: int | None = None
+SQUARE_THRESHOLD: int | None = 5_000
+COUNT_THRESHOLD: int | None = None
+# Counting characters with numpy beats Python from this many strings, of up to
+# this many characters.
+MIN_STRING_KERNEL_SIZE = 500
+MAX_STRING_KERNEL_WIDTH = 16
+
+# Squares of integers above this value don't fit in 64 bits.
+MAX_SQUARABLE_INT = 3_037_000_499
+INT_TYPECODES = "bBhHiIlLqQ"
+
+Vector = Any  # numpy.ndarray when numpy is installed, array.array otherwise
+
+
+def is_array_like(data: Any) -> bool:
+    return isinstance(data, array) or (np is not None and isinstance(data, np.ndarray))
+
+
+def should_vectorize(data: Any, threshold: int | None) -> bool:
+    """Only sized inputs are vectorized, so generators are never consumed twice.
+
+    Converting a list to an array only pays off above the threshold, and never
+    without numpy, so smaller lists keep the pure Python path.
+    """
+    if is_array_like(data):
+        return True
+    if np is None or threshold is None:
+        return False
+    return isinstance(data, Sized) and len(data) >= threshold
+
+
+def _to_numeric_array(numbers: Iterable[Any]) -> array:
+    if isinstance(numbers, array):
+        return numbers
+    try:
+        return array("q", numbers)
+    except TypeError:
+        return array("d", numbers)
+
+
+def filter_odd_numbers(
+    numbers: Iterable[int], threshold: int | None = FILTER_THRESHOLD
+) -> list[int] | Vector:
+    """Filters odd numbers from a sequence of numbers."""
+    if not should_vectorize(numbers, threshold):
+        return sol.filter_odd_numbers(numbers)
+    if np is not None:
+        values = np.asarray(numbers)
+        return values[values % 2 == 0]
+    values = _to_numeric_array(numbers)
+    return array(values.typecode, [num for num in values if num % 2 == 0])
+
+
+def square_numbers(
+    numbers: Iterable[sol.NumericType], threshold: int | None = SQUARE_THRESHOLD
+) -> list[float] | Vector:
+    """Square numbers in a sequence."""
+    if not should_vectorize(numbers, threshold):
+        return sol.square_numbers(numbers)
+    if np is not None:
+        values = np.asarray(numbers)
+        if values.dtype.kind in "iu":
+            # Squares of smaller integer types overflow their type, so they're
+            # squared as int64.
+            if values.size and (
+                max(abs(int(values.min())), int(values.max())) > MAX_SQUARABLE_INT
+            ):
+                return sol.square_numbers(values.tolist())  # exact Python ints
+            values = values.astype(np.int64, copy=False)
+        return np.square(values)
+    values = _to_numeric_array(numbers)
+    if values.typecode in INT_TYPECODES:
+        if values and max(abs(min(values)), max(values)) > MAX_SQUARABLE_INT:
+            return sol.square_numbers(numbers)
+        return array("q", [num * num for num in values])
+    return array(values.typecode, [num * num for num in values])
+
+
+def count(
+    words: Iterable[Sized], threshold: int | None = COUNT_THRESHOLD
+) -> list[float] | Vector:
+    """Counts the number of characters in a sequence of words."""
+    if not should_vectorize(words, threshold):
+        return sol.count(words)
+    if np is not None:
+        if isinstance(words, np.ndarray) and words.dtype.kind in "US":
+            return _string_lengths(words)
+        if isinstance(words, np.ndarray):  # object arrays are fastest in Python
+            return sol.count(words)
+        return np.fromiter(map(len, words), dtype=np.int64, count=len(words))  # type: ignore
+    return array("q", map(len, words))
+
+
+def _string_lengths(words: Vector) -> Vector:
+    """Lengths of fixed-width numpy strings, much faster than np.char.str_len.
+
+    Strings are padded with NUL characters, which numpy strips from the end of
+    every string, so a length is the position of the last non-NUL character.
+    That takes a pass per character position, so few or wide strings are
+    measured in Python instead.
+    """
+    char_size = 4 if words.dtype.kind == "U" else 1
+    width = words.dtype.itemsize // char_size
+    if len(words) < MIN_STRING_KERNEL_SIZE:
+        return sol.count(words.tolist())
+    if width > MAX_STRING_KERNEL_WIDTH:
+        return np.fromiter(map(len, words.tolist()), dtype=np.int64, count=len(words))
+    chars = np.ascontiguousarray(words).view(np.uint32 if char_size == 4 else np.uint8)
+    filled = np.ascontiguousarray(chars.reshape(len(words), width).T != 0)
+    lengths = np.zeros(len(words), dtype=np.int64)
+    for position in range(width):
+        np.copyto(lengths, position + 1, where=filled[position])
+    return lengths
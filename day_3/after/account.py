@@ -1,7 +1,10 @@
 from enum import Enum
 from decimal import Decimal
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
+from events import PRINT_SINK, EventSink, Level
+from ledger import Ledger, encode_amount
 from payment_service import PaymentService
 
 
@@ -15,17 +18,51 @@ class Account:
     account_number: str
     balance: Decimal
     account_type: AccountType
+    ledger: Optional[Ledger] = field(default=None, repr=False, compare=False)
+    events: EventSink = field(default=PRINT_SINK, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.ledger:
+            return
+        if self.account_number in self.ledger.balances:
+            # The ledger is the source of truth for accounts it already knows.
+            self.balance = self.ledger.balances[self.account_number]
+        else:
+            self.ledger.open_account(self.account_number, self.balance)
 
     def deposit(self, amount: Decimal, payment_service: PaymentService) -> None:
-        print(
-            f"Depositing {amount} into {self.account_type.value} Account {self.account_number}."
-        )
+        if self.events.level <= Level.INFO:
+            self.events.emit(
+                Level.INFO,
+                f"Depositing {amount} into {self.account_type.value} Account "
+                f"{self.account_number}.",
+            )
+        self._check_recordable(amount)
         payment_service.process_payment(amount)
-        self.balance += amount
+        self.credit(amount)
 
     def withdraw(self, amount: Decimal, payment_service: PaymentService) -> None:
-        print(
-            f"Withdrawing {amount} from {self.account_type.value} Account {self.account_number}."
-        )
+        if self.events.level <= Level.INFO:
+            self.events.emit(
+                Level.INFO,
+                f"Withdrawing {amount} from {self.account_type.value} Account "
+                f"{self.account_number}.",
+            )
+        self._check_recordable(amount)
         payment_service.process_payout(amount)
+        self.debit(amount)
+
+    def _check_recordable(self, amount: Decimal) -> None:
+        # Fail before the payment service is charged, not when the ledger writes.
+        if self.ledger:
+            encode_amount(amount)
+
+    def credit(self, amount: Decimal) -> None:
+        if self.ledger:
+            self.ledger.credit(self.account_number, amount)
+        self.balance += amount
+
+    def debit(self, amount: Decimal) -> None:
+        if self.ledger:
+            self.ledger.debit(self.account_number, amount)
         self.balance -= amount
@@ -0,0 +1,184 @@
+from array import array
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Iterable, Iterator, Optional
+
+from account import Account, AccountType
+from events import PRINT_SINK, EventSink, Level
+from payment_service import PaymentService
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, bulk operations fall back to a Python loop
+    np = None  # type: ignore[assignment]
+
+CENT = Decimal("0.01")
+# Interest is computed with int64 numpy arrays while balance * numerator and
+# 2 * remainder stay below this, and with exact Python ints otherwise.
+MAX_VECTORIZED_PRODUCT = 2**62
+ACCOUNT_TYPES = list(AccountType)
+
+
+def to_cents(amount: Decimal) -> int:
+    return int(amount.quantize(CENT, rounding=ROUND_HALF_EVEN) * 100)
+
+
+def from_cents(cents: int) -> Decimal:
+    return Decimal(cents) / 100
+
+
+class AccountView:
+    """Lightweight view on one account in an AccountStore, with the Account API.
+
+    Events are emitted through the event sink of the store.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "AccountStore", row: int) -> None:
+        self._store = store
+        self._row = row
+
+    @property
+    def account_number(self) -> str:
+        return self._store.account_numbers[self._row]
+
+    @property
+    def balance(self) -> Decimal:
+        return from_cents(self._store.balances[self._row])
+
+    @balance.setter
+    def balance(self, balance: Decimal) -> None:
+        self._store.balances[self._row] = to_cents(balance)
+
+    @property
+    def account_type(self) -> AccountType:
+        return ACCOUNT_TYPES[self._store.account_types[self._row]]
+
+    def deposit(self, amount: Decimal, payment_service: PaymentService) -> None:
+        if self._store.events.level <= Level.INFO:
+            self._store.events.emit(
+                Level.INFO,
+                f"Depositing {amount} into {self.account_type.value} Account "
+                f"{self.account_number}.",
+            )
+        payment_service.process_payment(amount)
+        self.credit(amount)
+
+    def withdraw(self, amount: Decimal, payment_service: PaymentService) -> None:
+        if self._store.events.level <= Level.INFO:
+            self._store.events.emit(
+                Level.INFO,
+                f"Withdrawing {amount} from {self.account_type.value} Account "
+                f"{self.account_number}.",
+            )
+        payment_service.process_payout(amount)
+        self.debit(amount)
+
+    def credit(self, amount: Decimal) -> None:
+        self._store.balances[self._row] += to_cents(amount)
+
+    def debit(self, amount: Decimal) -> None:
+        self._store.balances[self._row] -= to_cents(amount)
+
+    def __repr__(self) -> str:
+        return (
+            f"AccountView(account_number={self.account_number!r}, "
+            f"balance={self.balance!r}, account_type={self.account_type})"
+        )
+
+
+class AccountStore:
+    """Keeps accounts in parallel arrays instead of one Account object each.
+
+    Balances are stored as int64 cents and account types as one byte, so bulk
+    operations like applying interest run over compact arrays, vectorized with
+    numpy when it's installed.
+    """
+
+    def __init__(self, events: EventSink = PRINT_SINK) -> None:
+        self.events = events
+        self.account_numbers: list[str] = []
+        self.balances = array("q")
+        self.account_types = array("b")
+        self._rows: dict[str, int] = {}
+
+    @classmethod
+    def from_accounts(cls, accounts: Iterable[Account]) -> "AccountStore":
+        store = cls()
+        for account in accounts:
+            store.add(account.account_number, account.balance, account.account_type)
+        return store
+
+    def add(
+        self, account_number: str, balance: Decimal, account_type: AccountType
+    ) -> AccountView:
+        if account_number in self._rows:
+            raise ValueError(f"Account {account_number} already exists.")
+        row = len(self.account_numbers)
+        self._rows[account_number] = row
+        self.account_numbers.append(account_number)
+        self.balances.append(to_cents(balance))
+        self.account_types.append(ACCOUNT_TYPES.index(account_type))
+        return AccountView(self, row)
+
+    def __getitem__(self, account_number: str) -> AccountView:
+        return AccountView(self, self._rows[account_number])
+
+    def __len__(self) -> int:
+        return len(self.account_numbers)
+
+    def __iter__(self) -> Iterator[AccountView]:
+        return (AccountView(self, row) for row in range(len(self)))
+
+    def apply_interest(
+        self, rate: Decimal, account_type: Optional[AccountType] = None
+    ) -> None:
+        """Adds rate * balance to every account (of the given type), rounded to cents."""
+        numerator, denominator = rate.as_integer_ratio()
+        type_code = ACCOUNT_TYPES.index(account_type) if account_type else -1
+
+        if np is not None and self._fits_int64(numerator, denominator):
+            balances = np.frombuffer(self.balances, dtype=np.int64)
+            selected = (
+                np.frombuffer(self.account_types, dtype=np.int8) == type_code
+                if account_type
+                else slice(None)
+            )
+            quotient, remainder = np.divmod(balances[selected] * numerator, denominator)
+            round_up = (2 * remainder > denominator) | (
+                (2 * remainder == denominator) & (quotient % 2 == 1)
+            )
+            balances[selected] += quotient + round_up
+            return
+
+        for row, cents in enumerate(self.balances):
+            if account_type and self.account_types[row] != type_code:
+                continue
+            interest, rest = divmod(cents * numerator, denominator)
+            if 2 * rest > denominator or (
+                2 * rest == denominator and interest % 2 == 1
+            ):
+                interest += 1
+            self.balances[row] = cents + interest
+
+    def _fits_int64(self, numerator: int, denominator: int) -> bool:
+        if not self.balances:
+            return True
+        balances = np.frombuffer(self.balances, dtype=np.int64)
+        largest = max(-int(balances.min()), int(balances.max()))
+        return (
+            largest * abs(numerator) < MAX_VECTORIZED_PRODUCT
+            and denominator < MAX_VECTORIZED_PRODUCT
+        )
+
+    def total_balance(self, account_type: Optional[AccountType] = None) -> Decimal:
+        if not account_type:
+            return from_cents(sum(self.balances))
+        type_code = ACCOUNT_TYPES.index(account_type)
+        return from_cents(
+            sum(
+                cents
+                for cents, code in zip(self.balances, self.account_types)
+                if code == type_code
+            )
+        )
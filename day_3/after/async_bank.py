@@ -0,0 +1,70 @@
+import asyncio
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Protocol
+
+from account import Account
+
+DEFAULT_LOCK_STRIPES = 64
+
+
+class InsufficientFundsError(Exception):
+    pass
+
+
+class AsyncPaymentService(Protocol):
+    async def process_payment(self, amount: Decimal) -> None:
+        ...
+
+    async def process_payout(self, amount: Decimal) -> None:
+        ...
+
+
+@dataclass
+class AsyncStripePaymentService:
+    api_key: str
+    latency: float = 0.0  # simulated round trip to Stripe, in seconds
+
+    async def process_payment(self, amount: Decimal) -> None:
+        await asyncio.sleep(self.latency)
+
+    async def process_payout(self, amount: Decimal) -> None:
+        await asyncio.sleep(self.latency)
+
+
+class AsyncBankService:
+    """Processes transactions concurrently, serializing them only per account.
+
+    Accounts are mapped on a fixed set of locks by account number (lock striping),
+    so memory doesn't grow with the number of accounts. Transactions on accounts
+    that share a stripe wait for each other, all others run concurrently.
+    """
+
+    def __init__(self, lock_stripes: int = DEFAULT_LOCK_STRIPES) -> None:
+        self._locks = [asyncio.Lock() for _ in range(lock_stripes)]
+
+    def _lock_for(self, account: Account) -> asyncio.Lock:
+        return self._locks[hash(account.account_number) % len(self._locks)]
+
+    async def deposit(
+        self, amount: Decimal, account: Account, payment_service: AsyncPaymentService
+    ) -> None:
+        async with self._lock_for(account):
+            await payment_service.process_payment(amount)
+            account.credit(amount)
+
+    async def withdraw(
+        self, amount: Decimal, account: Account, payment_service: AsyncPaymentService
+    ) -> None:
+        """Pays out the amount, unless that would overdraw the account.
+
+        The balance is checked before the payout and debited after it, which is
+        only safe because the lock keeps other transactions on the account out.
+        """
+        async with self._lock_for(account):
+            if amount > account.balance:
+                raise InsufficientFundsError(
+                    f"Account {account.account_number} has insufficient funds."
+                )
+            await payment_service.process_payout(amount)
+            account.debit(amount)
@@ -1,15 +1,118 @@
+from dataclasses import dataclass, field
 from decimal import Decimal
+from types import TracebackType
+from typing import Optional, Sequence
 from account import Account
 from payment_service import PaymentService
 
 
+def process_payments(
+    payment_service: PaymentService, amounts: Sequence[Decimal]
+) -> None:
+    # Services that implement the protocol without subclassing it don't inherit
+    # the batch methods, so they get one call per amount.
+    if hasattr(payment_service, "process_payments"):
+        payment_service.process_payments(amounts)
+        return
+    for amount in amounts:
+        payment_service.process_payment(amount)
+
+
+def process_payouts(
+    payment_service: PaymentService, amounts: Sequence[Decimal]
+) -> None:
+    if hasattr(payment_service, "process_payouts"):
+        payment_service.process_payouts(amounts)
+        return
+    for amount in amounts:
+        payment_service.process_payout(amount)
+
+
+@dataclass
+class Transaction:
+    amount: Decimal
+    account: Account
+    payment_service: PaymentService
+    is_payout: bool = False
+    charged: bool = field(default=False, init=False)  # by the payment service
+    applied: bool = field(default=False, init=False)  # to the account balance
+
+
 class BankService:
+    """Processes transactions right away, or in batches when batch_size > 1.
+
+    Batched transactions are sent to their payment service in one call per batch,
+    and the account balances are only updated once the batch has been processed.
+    """
+
+    def __init__(self, batch_size: int = 1) -> None:
+        self.batch_size = batch_size
+        self.pending: list[Transaction] = []
+
     def deposit(
         self, amount: Decimal, account: Account, payment_service: PaymentService
     ) -> None:
-        account.deposit(amount, payment_service)
+        if self.batch_size <= 1:
+            account.deposit(amount, payment_service)
+            return
+        self._add(Transaction(amount, account, payment_service))
 
     def withdraw(
         self, amount: Decimal, account: Account, payment_service: PaymentService
     ) -> None:
-        account.withdraw(amount, payment_service)
+        if self.batch_size <= 1:
+            account.withdraw(amount, payment_service)
+            return
+        self._add(Transaction(amount, account, payment_service, is_payout=True))
+
+    def flush(self) -> None:
+        """Sends the pending transactions, one batch per service and direction.
+
+        Transactions remember whether they've been charged and applied, so if a
+        batch fails, flushing again only charges and applies what's left, and
+        nothing twice.
+        """
+        batches: dict[tuple[int, bool], list[Transaction]] = {}
+        for transaction in self.pending:
+            key = (id(transaction.payment_service), transaction.is_payout)
+            batches.setdefault(key, []).append(transaction)
+
+        try:
+            for (_, is_payout), transactions in batches.items():
+                payment_service = transactions[0].payment_service
+                uncharged = [t for t in transactions if not t.charged]
+                if uncharged:
+                    amounts = [transaction.amount for transaction in uncharged]
+                    if is_payout:
+                        process_payouts(payment_service, amounts)
+                    else:
+                        process_payments(payment_service, amounts)
+                    for transaction in uncharged:
+                        transaction.charged = True
+
+                for transaction in transactions:
+                    if transaction.applied:
+                        continue
+                    if is_payout:
+                        transaction.account.debit(transaction.amount)
+                    else:
+                        transaction.account.credit(transaction.amount)
+                    transaction.applied = True
+        finally:
+            self.pending = [t for t in self.pending if not t.applied]
+
+    def _add(self, transaction: Transaction) -> None:
+        self.pending.append(transaction)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def __enter__(self) -> "BankService":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.flush()
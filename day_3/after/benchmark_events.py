@@ -0,0 +1,45 @@
+import os
+from contextlib import redirect_stdout
+from decimal import Decimal
+from timeit import default_timer as timer
+
+from account import Account, AccountType
+from events import EventSink, FileSink, Level, NullSink, PrintSink, RingBufferSink
+from payment_service import StripePaymentService
+
+TRANSACTIONS = 100_000
+
+
+def run(events: EventSink) -> float:
+    account = Account("SA001", Decimal("1000"), AccountType.SAVINGS, events=events)
+    payment_service = StripePaymentService(api_key="sk_test", events=events)
+    amount = Decimal("1")
+    start = timer()
+    for _ in range(TRANSACTIONS // 2):
+        account.deposit(amount, payment_service)
+        account.withdraw(amount, payment_service)
+    return timer() - start
+
+
+def main() -> None:
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with redirect_stdout(devnull):
+            timings = {
+                "print (to /dev/null)": run(PrintSink()),
+                "ring buffer": run(RingBufferSink()),
+            }
+        file_sink = FileSink(devnull)
+        start = timer()
+        run(file_sink)
+        file_sink.close()
+        timings["file writer (incl. drain)"] = timer() - start
+    timings["print, level WARNING"] = run(PrintSink(level=Level.WARNING))
+    timings["null sink"] = run(NullSink())
+
+    print(f"{TRANSACTIONS:,} transactions:")
+    for name, elapsed in timings.items():
+        print(f"{name:<28}{elapsed:>8.3f}s {TRANSACTIONS / elapsed:>12,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
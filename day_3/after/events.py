@@ -0,0 +1,94 @@
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Optional, Protocol, TextIO
+
+
+class Level(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    DISABLED = 100
+
+
+class EventSink(Protocol):
+    """Receives events from the hot path.
+
+    Callers check `sink.level <= level` before building the message, so a sink
+    with a higher level costs one comparison per event and no formatting.
+    """
+
+    @property
+    def level(self) -> Level:
+        ...
+
+    def emit(self, level: Level, message: str) -> None:
+        ...
+
+
+@dataclass(frozen=True)
+class NullSink:
+    level: Level = Level.DISABLED
+
+    def emit(self, level: Level, message: str) -> None:
+        pass
+
+
+@dataclass(frozen=True)
+class PrintSink:
+    level: Level = Level.INFO
+
+    def emit(self, level: Level, message: str) -> None:
+        print(message)
+
+
+@dataclass
+class RingBufferSink:
+    """Keeps the last `capacity` events in memory."""
+
+    capacity: int = 10_000
+    level: Level = Level.INFO
+    events: deque[tuple[float, Level, str]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.events = deque(maxlen=self.capacity)
+
+    def emit(self, level: Level, message: str) -> None:
+        self.events.append((time.time(), level, message))
+
+
+class FileSink:
+    """Collects events in batches and writes them to a file from a background thread."""
+
+    def __init__(
+        self, file: TextIO, level: Level = Level.INFO, batch_size: int = 1_000
+    ) -> None:
+        self.level = level
+        self.file = file
+        self.batch_size = batch_size
+        self._batch: list[str] = []
+        self._queue: queue.SimpleQueue[Optional[list[str]]] = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+    def emit(self, level: Level, message: str) -> None:
+        self._batch.append(f"{time.time():.6f} {level.name} {message}\n")
+        if len(self._batch) >= self.batch_size:
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def close(self) -> None:
+        self._queue.put(self._batch)
+        self._queue.put(None)
+        self._writer.join()
+        self.file.flush()
+
+    def _write(self) -> None:
+        while (batch := self._queue.get()) is not None:
+            self.file.writelines(batch)
+
+
+PRINT_SINK = PrintSink()
@@ -0,0 +1,225 @@
+import json
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from decimal import Decimal
+from enum import IntEnum
+from typing import Iterator, Optional
+
+# Every entry is a crc32 of the rest of the entry, a body with the timestamp, kind,
+# amount length and account number length, the amount as a decimal string and the
+# account number. Amounts are stored as strings so any finite Decimal is exact.
+CHECKSUM = struct.Struct("<I")
+BODY = struct.Struct("<dBHB")
+HEADER_SIZE = CHECKSUM.size + BODY.size
+MAX_AMOUNT_LENGTH = 2**16 - 1
+MAX_ACCOUNT_LENGTH = 2**8 - 1
+
+
+class EntryKind(IntEnum):
+    OPEN = 0
+    CREDIT = 1
+    DEBIT = 2
+
+
+@dataclass
+class LedgerEntry:
+    offset: int
+    timestamp: float
+    kind: EntryKind
+    account_number: str
+    amount: Decimal
+    size: int  # in bytes, in the log
+
+
+@dataclass
+class Snapshot:
+    offset: int
+    timestamp: float
+    balances: dict[str, Decimal]
+
+
+def encode_amount(amount: Decimal) -> bytes:
+    """Encodes an amount for the log, raising ValueError if it can't be stored.
+
+    Call it before anything else happens to the amount, like charging it.
+    """
+    if not amount.is_finite():
+        raise ValueError(f"Can't record a non-finite amount: {amount}.")
+    encoded = str(amount).encode("ascii")
+    if len(encoded) > MAX_AMOUNT_LENGTH:
+        raise ValueError("Amount has too many digits to record.")
+    return encoded
+
+
+def decode_amount(encoded: bytes) -> Decimal:
+    return Decimal(encoded.decode("ascii"))
+
+
+def apply_entry(
+    balances: dict[str, Decimal], kind: EntryKind, account_number: str, amount: Decimal
+) -> None:
+    if kind == EntryKind.OPEN:
+        balances[account_number] = amount
+    elif kind == EntryKind.CREDIT:
+        balances[account_number] += amount
+    else:
+        balances[account_number] -= amount
+
+
+class Ledger:
+    """Append-only binary transaction log with periodic balance snapshots.
+
+    Writes are buffered and made durable with one fsync per group of entries (group
+    commit), so a crash loses at most the last uncommitted group. Snapshots of all
+    balances are stored next to the log, so recovery and balance-at-time queries
+    only replay the entries written after the closest snapshot. Opening an existing
+    ledger recovers its balances and drops a torn entry at the end of the log.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        group_size: int = 1_000,
+        group_interval: float = 0.05,
+        snapshot_every: Optional[int] = 100_000,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.snapshot_path = f"{self.path}.snapshots"
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.snapshot_every = snapshot_every
+        self.balances: dict[str, Decimal] = {}
+        self._uncommitted = 0
+        self._since_snapshot = 0
+        self._last_commit = time.monotonic()
+
+        if os.path.exists(self.path):
+            os.truncate(self.path, self._recover())
+        self._file = open(self.path, "ab")
+
+    def open_account(self, account_number: str, balance: Decimal) -> None:
+        self._append(EntryKind.OPEN, account_number, balance)
+
+    def credit(self, account_number: str, amount: Decimal) -> None:
+        self._append(EntryKind.CREDIT, account_number, amount)
+
+    def debit(self, account_number: str, amount: Decimal) -> None:
+        self._append(EntryKind.DEBIT, account_number, amount)
+
+    def commit(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def snapshot(self) -> None:
+        self.commit()
+        offset = self._file.tell()
+        timestamp = time.time()
+        record = {
+            "offset": offset,
+            "timestamp": timestamp,
+            "balances": {number: str(value) for number, value in self.balances.items()},
+        }
+        with open(self.snapshot_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self._since_snapshot = 0
+
+    def close(self) -> None:
+        self.commit()
+        self._file.close()
+
+    def entries(self, offset: int = 0) -> Iterator[LedgerEntry]:
+        """Yields the entries from offset on, stopping at a torn or corrupt entry."""
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            while header := file.read(HEADER_SIZE):
+                if len(header) < HEADER_SIZE:
+                    return
+                (checksum,) = CHECKSUM.unpack_from(header)
+                timestamp, kind, amount_length, account_length = BODY.unpack_from(
+                    header, CHECKSUM.size
+                )
+                data = file.read(amount_length + account_length)
+                body = header[CHECKSUM.size :] + data
+                if len(data) < amount_length + account_length or (
+                    zlib.crc32(body) != checksum
+                ):
+                    return
+                yield LedgerEntry(
+                    offset,
+                    timestamp,
+                    EntryKind(kind),
+                    data[amount_length:].decode("utf-8"),
+                    decode_amount(data[:amount_length]),
+                    len(header) + len(data),
+                )
+                offset += len(header) + len(data)
+
+    def balance_at(self, account_number: str, timestamp: float) -> Decimal:
+        snapshot = self._load_snapshot(before=timestamp)
+        balances = snapshot.balances if snapshot else {}
+        for entry in self.entries(snapshot.offset if snapshot else 0):
+            if entry.timestamp > timestamp:
+                break
+            apply_entry(balances, entry.kind, entry.account_number, entry.amount)
+        return balances.get(account_number, Decimal("0"))
+
+    def _append(self, kind: EntryKind, account_number: str, amount: Decimal) -> None:
+        encoded = encode_amount(amount)
+        account = account_number.encode("utf-8")
+        if len(account) > MAX_ACCOUNT_LENGTH:
+            raise ValueError(f"Account number too long to record: {account_number}")
+        header = BODY.pack(time.time(), kind, len(encoded), len(account))
+        body = header + encoded + account
+        self._file.write(CHECKSUM.pack(zlib.crc32(body)) + body)
+
+        apply_entry(self.balances, kind, account_number, amount)
+
+        self._uncommitted += 1
+        self._since_snapshot += 1
+        if (
+            self._uncommitted >= self.group_size
+            or time.monotonic() - self._last_commit >= self.group_interval
+        ):
+            self.commit()
+        if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def _load_snapshot(self, before: float = float("inf")) -> Optional[Snapshot]:
+        if not os.path.exists(self.snapshot_path):
+            return None
+        latest = None
+        with open(self.snapshot_path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:  # torn snapshot at the end of the file
+                    break
+                if record["timestamp"] > before:
+                    break
+                latest = record
+        if latest is None:
+            return None
+        return Snapshot(
+            latest["offset"],
+            latest["timestamp"],
+            {number: Decimal(value) for number, value in latest["balances"].items()},
+        )
+
+    def _recover(self) -> int:
+        """Rebuilds the balances from the last snapshot and returns the end of the log."""
+        snapshot = self._load_snapshot()
+        end = 0
+        if snapshot:
+            self.balances = snapshot.balances
+            end = snapshot.offset
+        for entry in self.entries(end):
+            apply_entry(self.balances, entry.kind, entry.account_number, entry.amount)
+            end = entry.offset + entry.size
+        return end
@@ -0,0 +1,75 @@
+import asyncio
+import random
+from decimal import Decimal
+from timeit import default_timer as timer
+
+from account import Account, AccountType
+from async_bank import (
+    AsyncBankService,
+    AsyncStripePaymentService,
+    InsufficientFundsError,
+)
+
+ACCOUNTS = 100
+TRANSACTIONS = 10_000
+LATENCY = 0.001
+INITIAL_BALANCE = Decimal("100")  # low, so many withdrawals need the check
+
+
+async def run(lock_stripes: int) -> None:
+    rng = random.Random(42)
+    accounts = [
+        Account(f"SA{i:03}", INITIAL_BALANCE, AccountType.SAVINGS)
+        for i in range(ACCOUNTS)
+    ]
+    bank_service = AsyncBankService(lock_stripes=lock_stripes)
+    payment_service = AsyncStripePaymentService(api_key="sk_test", latency=LATENCY)
+
+    transactions = []
+    changes: list[tuple[Account, Decimal]] = []
+    for _ in range(TRANSACTIONS):
+        account = rng.choice(accounts)
+        amount = Decimal(rng.randint(1, 100))
+        if rng.random() < 0.5:
+            transactions.append(bank_service.deposit(amount, account, payment_service))
+            changes.append((account, amount))
+        else:
+            transactions.append(bank_service.withdraw(amount, account, payment_service))
+            changes.append((account, -amount))
+
+    start = timer()
+    results = await asyncio.gather(*transactions, return_exceptions=True)
+    elapsed = timer() - start
+
+    # Without the locks, concurrent withdrawals would all pass the balance check
+    # before any of them is debited, and overdraw the accounts.
+    expected = {account.account_number: INITIAL_BALANCE for account in accounts}
+    declined = 0
+    for (account, change), result in zip(changes, results):
+        if isinstance(result, InsufficientFundsError):
+            declined += 1
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            expected[account.account_number] += change
+    assert all(account.balance >= 0 for account in accounts)
+    assert all(
+        account.balance == expected[account.account_number] for account in accounts
+    )
+    print(
+        f"{lock_stripes:>4} lock stripes: {TRANSACTIONS / elapsed:>9,.0f} "
+        f"transactions/s, {declined:,} overdrafts declined, balances correct"
+    )
+
+
+def main() -> None:
+    print(
+        f"{TRANSACTIONS:,} transactions on {ACCOUNTS} accounts, "
+        f"{LATENCY * 1000:.0f} ms payment latency"
+    )
+    for lock_stripes in [1, 16, 256]:
+        asyncio.run(run(lock_stripes))
+
+
+if __name__ == "__main__":
+    main()
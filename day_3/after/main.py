@@ -22,6 +22,15 @@ def main() -> None:
     print(f"Savings Account Balance: {savings_account.balance}")
     print(f"Checking Account Balance: {checking_account.balance}")
 
+    # Process many transactions with one Stripe call per batch
+    with BankService(batch_size=100) as batch_bank_service:
+        for _ in range(250):
+            batch_bank_service.deposit(Decimal("1"), savings_account, payment_service)
+            batch_bank_service.withdraw(Decimal("1"), checking_account, payment_service)
+
+    print(f"Savings Account Balance: {savings_account.balance}")
+    print(f"Checking Account Balance: {checking_account.balance}")
+
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,9 @@
-from typing import Protocol
-from dataclasses import dataclass
+from typing import Protocol, Sequence
+from dataclasses import dataclass, field
 from decimal import Decimal
 
+from events import PRINT_SINK, EventSink, Level
+
 
 class PaymentService(Protocol):
     def process_payment(self, amount: Decimal) -> None:
@@ -10,17 +12,45 @@ class PaymentService(Protocol):
     def process_payout(self, amount: Decimal) -> None:
         ...
 
+    def process_payments(self, amounts: Sequence[Decimal]) -> None:
+        for amount in amounts:
+            self.process_payment(amount)
+
+    def process_payouts(self, amounts: Sequence[Decimal]) -> None:
+        for amount in amounts:
+            self.process_payout(amount)
+
 
 @dataclass
 class StripePaymentService(PaymentService):
     api_key: str
+    events: EventSink = field(default=PRINT_SINK, repr=False)
 
     def set_api_key(self, api_key: str) -> None:
-        print(f"Setting Stripe API key to {api_key}.")
+        if self.events.level <= Level.INFO:
+            self.events.emit(Level.INFO, f"Setting Stripe API key to {api_key}.")
         self.api_key = api_key
 
     def process_payment(self, amount: Decimal) -> None:
-        print(f"Processing payment of {amount} via Stripe.")
+        if self.events.level <= Level.INFO:
+            self.events.emit(Level.INFO, f"Processing payment of {amount} via Stripe.")
 
     def process_payout(self, amount: Decimal) -> None:
-        print(f"Processing payout of {amount} via Stripe.")
+        if self.events.level <= Level.INFO:
+            self.events.emit(Level.INFO, f"Processing payout of {amount} via Stripe.")
+
+    def process_payments(self, amounts: Sequence[Decimal]) -> None:
+        if self.events.level <= Level.INFO:
+            self.events.emit(
+                Level.INFO,
+                f"Processing batch of {len(amounts)} payments totalling "
+                f"{sum(amounts, Decimal(0))} via Stripe.",
+            )
+
+    def process_payouts(self, amounts: Sequence[Decimal]) -> None:
+        if self.events.level <= Level.INFO:
+            self.events.emit(
+                Level.INFO,
+                f"Processing batch of {len(amounts)} payouts totalling "
+                f"{sum(amounts, Decimal(0))} via Stripe.",
+            )
@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+import pytest
+
+from account import Account, AccountType
+from events import NullSink
+from ledger import Ledger
+
+
+class CountingPaymentService:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def process_payment(self, amount: Decimal) -> None:
+        self.calls += 1
+
+    def process_payout(self, amount: Decimal) -> None:
+        self.calls += 1
+
+
+def open_account(ledger: Ledger, balance: str = "100") -> Account:
+    return Account(
+        "SA001", Decimal(balance), AccountType.SAVINGS, ledger=ledger, events=NullSink()
+    )
+
+
+def test_recovers_balances_after_reopen(tmp_path):
+    path = tmp_path / "ledger.log"
+    ledger = Ledger(path)
+    account = open_account(ledger)
+    account.credit(Decimal(1) / Decimal(3))
+    account.debit(Decimal("12.50"))
+    ledger.close()
+
+    reopened = Ledger(path)
+    assert reopened.balances == {"SA001": account.balance}
+    assert open_account(reopened, balance="0").balance == account.balance
+    assert [entry.amount for entry in reopened.entries()] == [
+        Decimal("100"),
+        Decimal(1) / Decimal(3),
+        Decimal("12.50"),
+    ]
+
+
+def test_recovers_from_snapshot_and_drops_torn_entry(tmp_path):
+    path = tmp_path / "ledger.log"
+    ledger = Ledger(path, snapshot_every=2)
+    account = open_account(ledger)
+    for _ in range(5):
+        account.credit(Decimal("1.25"))
+    ledger.close()
+    with open(path, "ab") as file:
+        file.write(b"\x01\x02\x03")  # an entry torn by a crash
+
+    reopened = Ledger(path)
+    assert reopened.balances == {"SA001": Decimal("106.25")}
+    reopened.credit("SA001", Decimal("1"))
+    reopened.close()
+    assert Ledger(path).balances == {"SA001": Decimal("107.25")}
+
+
+@pytest.mark.parametrize(
+    "amount", [Decimal("NaN"), Decimal("Infinity"), Decimal("1" * 70_000)]
+)
+def test_rejects_unrecordable_amount_before_charging(tmp_path, amount):
+    ledger = Ledger(tmp_path / "ledger.log")
+    account = open_account(ledger)
+    payment_service = CountingPaymentService()
+
+    with pytest.raises(ValueError):
+        account.deposit(amount, payment_service)
+    with pytest.raises(ValueError):
+        account.withdraw(amount, payment_service)
+
+    assert payment_service.calls == 0
+    assert account.balance == ledger.balances["SA001"] == Decimal("100")
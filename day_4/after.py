@@ -1,7 +1,9 @@
 from decimal import Decimal
 from dataclasses import dataclass
 from enum import Enum
-from typing import Iterable, Optional
+from typing import Callable, Iterable, Optional
+
+from money import Money, to_money
 
 
 class OrderType(Enum):
@@ -12,7 +14,10 @@ class OrderType(Enum):
 @dataclass
 class Item:
     name: str
-    price: Decimal
+    price: Money
+
+    def __post_init__(self) -> None:
+        self.price = to_money(self.price)
 
 
 class EmailType(Enum):
@@ -20,7 +25,22 @@ class EmailType(Enum):
     ORDER_SHIPPING_NOTIFICATION = "Order Shipping Notification"
 
 
-@dataclass
+SENDER = "sales@webshop.com"
+
+EmailTemplate = Callable[[int], str]
+
+# Email bodies by type, as compiled f-strings that take the order id.
+EMAIL_TEMPLATES: dict[EmailType, EmailTemplate] = {
+    EmailType.ORDER_CONFIRMATION: lambda order_id: (
+        f"Thank you for your order! Your order #{order_id} has been confirmed."
+    ),
+    EmailType.ORDER_SHIPPING_NOTIFICATION: lambda order_id: (
+        f"Good news! Your order #{order_id} has been shipped and is on its way."
+    ),
+}
+
+
+@dataclass(slots=True)
 class Email:
     body: str
     subject: str
@@ -35,10 +55,10 @@ class Order:
     customer_email: str
     items: Iterable[Item]
 
-    def calculate_total_price(self, discount: Optional[Decimal] = None) -> Decimal:
-        price = Decimal(sum(item.price for item in self.items))
+    def calculate_total_price(self, discount: Optional[Decimal] = None) -> Money:
+        price = Money(sum(item.price.minor_units for item in self.items))
         if discount:
-            price = price - (price * discount)
+            price = price - price.percentage(discount)
         return price
 
     def process(self) -> None:
@@ -49,30 +69,22 @@ class Order:
         print("Order processed successfully.")
 
     def generate_email(self, email_type: EmailType) -> Email:
-        if email_type == EmailType.ORDER_CONFIRMATION:
-            body = (
-                f"Thank you for your order! Your order #{self.id} has been confirmed."
-            )
-        elif email_type == EmailType.ORDER_SHIPPING_NOTIFICATION:
-            body = (
-                f"Good news! Your order #{self.id} has been shipped and is on its way."
-            )
-        else:
+        if email_type not in EMAIL_TEMPLATES:
             raise ValueError(f"Invalid email type: {email_type}")
 
         return Email(
-            body=body,
+            body=EMAIL_TEMPLATES[email_type](self.id),
             subject=email_type.value,
             recipient=self.customer_email,
-            sender="sales@webshop.com",
+            sender=SENDER,
         )
 
 
 def main() -> None:
     items = [
-        Item(name="T-Shirt", price=Decimal("19.99")),
-        Item(name="Jeans", price=Decimal("49.99")),
-        Item(name="Shoes", price=Decimal("79.99")),
+        Item(name="T-Shirt", price=to_money(Decimal("19.99"))),
+        Item(name="Jeans", price=to_money(Decimal("49.99"))),
+        Item(name="Shoes", price=to_money(Decimal("79.99"))),
     ]
 
     online_order = Order(
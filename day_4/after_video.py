@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Iterable, Optional
 
+from money import Money, to_money
+
 
 class OrderType(Enum):
     ONLINE = "online"
@@ -12,7 +14,10 @@ class OrderType(Enum):
 @dataclass
 class Item:
     name: str
-    price: Decimal
+    price: Money
+
+    def __post_init__(self) -> None:
+        self.price = to_money(self.price)
 
 
 class EmailType(Enum):
@@ -35,10 +40,10 @@ class Order:
     customer_email: str
     items: Iterable[Item]
 
-    def calculate_total_price(self, discount: Optional[Decimal] = None) -> Decimal:
-        price = Decimal(sum(item.price for item in self.items))
+    def calculate_total_price(self, discount: Optional[Decimal] = None) -> Money:
+        price = Money(sum(item.price.minor_units for item in self.items))
         if discount:
-            price = price - (price * discount)
+            price = price - price.percentage(discount)
         return price
 
     def process(self) -> None:
@@ -81,9 +86,9 @@ class Order:
 
 def main() -> None:
     items = [
-        Item(name="T-Shirt", price=Decimal("19.99")),
-        Item(name="Jeans", price=Decimal("49.99")),
-        Item(name="Shoes", price=Decimal("79.99")),
+        Item(name="T-Shirt", price=to_money(Decimal("19.99"))),
+        Item(name="Jeans", price=to_money(Decimal("49.99"))),
+        Item(name="Shoes", price=to_money(Decimal("79.99"))),
     ]
 
     online_order = Order(
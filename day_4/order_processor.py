@@ -0,0 +1,170 @@
+import queue
+import threading
+from dataclasses import dataclass, field
+from decimal import Decimal
+from timeit import default_timer as timer
+from typing import Callable, Iterable, Optional
+
+from after import Email, EmailType, Item, Order, OrderType
+from money import to_money
+
+DEFAULT_QUEUE_SIZE = 1_000
+
+
+@dataclass
+class OrderJob:
+    order: Order
+    emails: list[Email] = field(default_factory=list)
+
+
+StageFunc = Callable[[OrderJob], None]
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy_time: float = 0.0
+    max_latency: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        return self.busy_time / self.processed if self.processed else 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<14}{self.workers:>3} workers {self.processed:>9,} orders "
+            f"{self.throughput:>11,.0f}/s  avg {self.avg_latency * 1e6:>8.1f}us  "
+            f"max {self.max_latency * 1e6:>9.1f}us  failed {self.failed}"
+        )
+
+
+def confirm_order(job: OrderJob) -> None:
+    job.emails.append(job.order.generate_email(EmailType.ORDER_CONFIRMATION))
+
+
+def ship_order(job: OrderJob) -> None:
+    job.emails.append(job.order.generate_email(EmailType.ORDER_SHIPPING_NOTIFICATION))
+
+
+class OrderProcessor:
+    """Runs orders through confirmation, shipping and email stages concurrently.
+
+    Every stage has its own pool of worker threads, connected to the next stage
+    by a bounded queue, so a slow stage makes the earlier stages wait instead of
+    buffering an unbounded number of orders (backpressure). Orders that fail in a
+    stage are counted and dropped.
+    """
+
+    def __init__(
+        self,
+        send_email: Callable[[Email], None],
+        ship: StageFunc = ship_order,
+        confirmation_workers: int = 1,
+        shipping_workers: int = 4,
+        email_workers: int = 4,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        def send_emails(job: OrderJob) -> None:
+            for email in job.emails:
+                send_email(email)
+
+        self.stages: list[tuple[StageFunc, StageStats]] = [
+            (confirm_order, StageStats("confirmation", confirmation_workers)),
+            (ship, StageStats("shipping", shipping_workers)),
+            (send_emails, StageStats("email", email_workers)),
+        ]
+        self.queue_size = queue_size
+
+    def process(self, orders: Iterable[Order]) -> list[StageStats]:
+        queues: list[queue.Queue[Optional[OrderJob]]] = [
+            queue.Queue(maxsize=self.queue_size) for _ in self.stages
+        ]
+        pools = []
+        for index, (func, stats) in enumerate(self.stages):
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            lock = threading.Lock()
+            pool = [
+                threading.Thread(
+                    target=self._work,
+                    args=(func, stats, lock, queues[index], outbox),
+                    daemon=True,  # so an interrupted process() doesn't hang the exit
+                )
+                for _ in range(stats.workers)
+            ]
+            for worker in pool:
+                worker.start()
+            pools.append(pool)
+
+        start = timer()
+        try:
+            for order in orders:
+                queues[0].put(OrderJob(order))
+        finally:
+            # Stop the stages in order, once all work before them has been handed
+            # over. This also runs if the orders raise, so no worker waits forever.
+            for index, pool in enumerate(pools):
+                for _ in pool:
+                    queues[index].put(None)
+                for worker in pool:
+                    worker.join()
+                self.stages[index][1].elapsed = timer() - start
+        return [stats for _, stats in self.stages]
+
+    @staticmethod
+    def _work(
+        func: StageFunc,
+        stats: StageStats,
+        lock: threading.Lock,
+        inbox: "queue.Queue[Optional[OrderJob]]",
+        outbox: "Optional[queue.Queue[Optional[OrderJob]]]",
+    ) -> None:
+        while (job := inbox.get()) is not None:
+            start = timer()
+            try:
+                func(job)
+            except Exception:  # pylint: disable=broad-except
+                with lock:
+                    stats.failed += 1
+                continue
+            latency = timer() - start
+            with lock:
+                stats.processed += 1
+                stats.busy_time += latency
+                stats.max_latency = max(stats.max_latency, latency)
+            if outbox:
+                outbox.put(job)
+
+
+def main() -> None:
+    items = [
+        Item(name="T-Shirt", price=to_money(Decimal("19.99"))),
+        Item(name="Jeans", price=to_money(Decimal("49.99"))),
+        Item(name="Shoes", price=to_money(Decimal("79.99"))),
+    ]
+    orders = (
+        Order(
+            id=order_id,
+            type=OrderType.ONLINE,
+            customer_email=f"customer{order_id}@gmail.com",
+            items=items,
+        )
+        for order_id in range(100_000)
+    )
+
+    outbox: list[Email] = []
+    processor = OrderProcessor(send_email=outbox.append)
+    for stats in processor.process(orders):
+        print(stats)
+    print(f"Emails sent: {len(outbox):,}")
+
+
+if __name__ == "__main__":
+    main()
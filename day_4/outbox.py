@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator, Protocol, Sequence
+
+from after import EMAIL_TEMPLATES, SENDER, Email, EmailType, Item, Order, OrderType
+from money import to_money
+
+
+@dataclass
+class EmailBatch:
+    """Emails of one type for many orders.
+
+    Only the order ids and recipients are stored, column-wise; subject and sender
+    are shared and the bodies are rendered from the template when needed.
+    """
+
+    email_type: EmailType
+    order_ids: list[int] = field(default_factory=list)
+    recipients: list[str] = field(default_factory=list)
+    sender: str = SENDER
+
+    def __len__(self) -> int:
+        return len(self.order_ids)
+
+    def body(self, index: int) -> str:
+        return EMAIL_TEMPLATES[self.email_type](self.order_ids[index])
+
+    def __iter__(self) -> Iterator[Email]:
+        render = EMAIL_TEMPLATES[self.email_type]
+        subject = self.email_type.value
+        for order_id, recipient in zip(self.order_ids, self.recipients):
+            yield Email(render(order_id), subject, recipient, self.sender)
+
+
+def render_emails(orders: Iterable[Order], email_type: EmailType) -> EmailBatch:
+    if email_type not in EMAIL_TEMPLATES:
+        raise ValueError(f"Invalid email type: {email_type}")
+    batch = EmailBatch(email_type)
+    for order in orders:
+        batch.order_ids.append(order.id)
+        batch.recipients.append(order.customer_email)
+    return batch
+
+
+class SMTPConnection(Protocol):
+    """The part of smtplib.SMTP the outbox uses."""
+
+    def sendmail(self, from_addr: str, to_addrs: Sequence[str], msg: str) -> object:
+        ...
+
+    def quit(self) -> object:
+        ...
+
+
+@dataclass
+class LocalSMTP:
+    """Stand-in for an SMTP server connection that keeps the sent messages."""
+
+    domain: str
+    sent: list[tuple[str, list[str], str]] = field(default_factory=list)
+
+    def sendmail(self, from_addr: str, to_addrs: Sequence[str], msg: str) -> object:
+        self.sent.append((from_addr, list(to_addrs), msg))
+        return {}
+
+    def quit(self) -> object:
+        return None
+
+
+def format_message(email: Email) -> str:
+    return (
+        f"From: {email.sender}\r\nTo: {email.recipient}\r\n"
+        f"Subject: {email.subject}\r\n\r\n{email.body}\r\n"
+    )
+
+
+@dataclass
+class Outbox:
+    """Groups emails per recipient domain, so every domain needs one connection."""
+
+    by_domain: dict[str, list[Email]] = field(default_factory=dict)
+
+    def add(self, email: Email) -> None:
+        domain = email.recipient.rpartition("@")[2].lower()
+        self.by_domain.setdefault(domain, []).append(email)
+
+    def add_batch(self, batch: EmailBatch) -> None:
+        for email in batch:
+            self.add(email)
+
+    def __len__(self) -> int:
+        return sum(len(emails) for emails in self.by_domain.values())
+
+    def flush(self, connect: Callable[[str], SMTPConnection]) -> int:
+        """Sends all emails, one connection per domain, and returns the number sent.
+
+        Sent emails are removed from the outbox even when sending fails, so flushing
+        again after an error only sends the emails that weren't sent yet.
+        """
+        sent = 0
+        for domain in list(self.by_domain):
+            emails = self.by_domain[domain]
+            delivered = 0
+            connection = connect(domain)
+            try:
+                for email in emails:
+                    connection.sendmail(
+                        email.sender, [email.recipient], format_message(email)
+                    )
+                    delivered += 1
+            finally:
+                connection.quit()
+                sent += delivered
+                del emails[:delivered]
+                if not emails:
+                    del self.by_domain[domain]
+        return sent
+
+
+def main() -> None:
+    items = [
+        Item(name="T-Shirt", price=to_money(Decimal("19.99"))),
+        Item(name="Jeans", price=to_money(Decimal("49.99"))),
+    ]
+    domains = ["gmail.com", "outlook.com", "webshop.com"]
+    orders = [
+        Order(
+            id=order_id,
+            type=OrderType.ONLINE,
+            customer_email=f"customer{order_id}@{domains[order_id % len(domains)]}",
+            items=items,
+        )
+        for order_id in range(10_000)
+    ]
+
+    outbox = Outbox()
+    outbox.add_batch(render_emails(orders, EmailType.ORDER_CONFIRMATION))
+    outbox.add_batch(render_emails(orders, EmailType.ORDER_SHIPPING_NOTIFICATION))
+
+    connections: list[LocalSMTP] = []
+
+    def connect(domain: str) -> LocalSMTP:
+        connections.append(LocalSMTP(domain))
+        return connections[-1]
+
+    sent = outbox.flush(connect)
+    print(f"Sent {sent:,} emails over {len(connections)} connections.")
+    print(connections[0].sent[0][2])
+
+
+if __name__ == "__main__":
+    main()
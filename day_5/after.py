@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 from decimal import Decimal
 
+from receipt import print_receipt
 
-@dataclass
+
+@dataclass(slots=True)
 class Item:
     name: str
     price: Decimal
@@ -20,15 +22,7 @@ def main():
     total = sum(item.price * item.quantity for item in items)
 
     # Print the cart
-    print("Shopping Cart:")
-    print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
-    for item in items:
-        total_price = item.price * item.quantity
-        print(
-            f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${total_price:>7.2f}"
-        )
-    print("=" * 40)
-    print(f"Total: ${total:>28.2f}")
+    print_receipt(items, [("Total", total)], amount_width=28)
 
 
 if __name__ == "__main__":
@@ -1,19 +1,25 @@
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Union, Literal
+from typing import Optional, TextIO, Union
 
+from money import Money, to_money
+from receipt import print_receipt, render_receipt
 
-@dataclass
+
+@dataclass(slots=True)
 class Item:
     name: str
-    price: Decimal
+    price: Money
     quantity: int
 
-    def total_price(self) -> Decimal:
+    def __post_init__(self) -> None:
+        self.price = to_money(self.price)
+
+    def total_price(self) -> Money:
         return self.price * self.quantity
 
-    def set_price(self, price: Decimal) -> None:
-        self.price = price
+    def set_price(self, price: Money | Decimal) -> None:
+        self.price = to_money(price)
 
     def set_quantity(self, quantity: int) -> None:
         self.quantity = quantity
@@ -30,18 +36,21 @@ class ShoppingCart:
     items: list[Item] = field(default_factory=list)
     discount_code: Union[str, None] = None
 
-    def total(self) -> Union[Decimal, Literal[0]]:
-        return sum(item.total_price() for item in self.items)
+    def total(self) -> Money:
+        return Money(
+            sum(item.price.minor_units * item.quantity for item in self.items)
+        )
+
+    def summary(self) -> list[tuple[str, Money]]:
+        return [("Total", self.total())]
+
+    def render(
+        self, format: str = "text", out: Optional[TextIO] = None
+    ) -> Optional[str]:
+        return render_receipt(self.items, self.summary(), format, out)
 
     def print_cart(self) -> None:
-        # Print the cart
-        total = self.total()
-        print("Shopping Cart:")
-        print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
-        for item in self.items:
-            item.print_item()
-        print("=" * 40)
-        print(f"Total: ${total:>7.2f}")
+        print_receipt(self.items, self.summary())
 
     def remove_item(self, item: Item) -> None:
         self.items.remove(item)
@@ -51,9 +60,9 @@ def main() -> None:
     # Create a shopping cart and add some items to it
     cart = ShoppingCart(
         items=[
-            Item("Apple", Decimal("1.5"), 10),
-            Item("Banana", Decimal("2"), 2),
-            Item("Pizza", Decimal("11.90"), 5),
+            Item("Apple", to_money(Decimal("1.5")), 10),
+            Item("Banana", to_money(Decimal("2")), 2),
+            Item("Pizza", to_money(Decimal("11.90")), 5),
         ],
     )
 
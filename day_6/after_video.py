@@ -1,20 +1,26 @@
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Union
+from typing import Iterable, Iterator, Optional, TextIO, Union
 
+from money import Money, to_money
+from receipt import print_receipt, render_receipt
 
-@dataclass
+
+@dataclass(slots=True)
 class Item:
     name: str
-    price: Decimal
+    price: Money
     quantity: int
 
+    def __post_init__(self) -> None:
+        self.price = to_money(self.price)
+
     @property
-    def subtotal(self) -> Decimal:
+    def subtotal(self) -> Money:
         return self.price * self.quantity
 
-    def set_price(self, price: Decimal) -> None:
-        self.price = price
+    def set_price(self, price: Money | Decimal) -> None:
+        self.price = to_money(price)
 
     def set_quantity(self, quantity: int) -> None:
         self.quantity = quantity
@@ -26,46 +32,89 @@ class Item:
         )
 
 
+class ItemIndex:
+    """Items in insertion order, indexed by name for O(1) lookups and removals."""
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self._items: dict[str, Item] = {}
+        for item in items:
+            self.append(item)
+
+    def append(self, item: Item) -> None:
+        if item.name in self._items:
+            raise ValueError(f"Item '{item.name}' is already in the cart.")
+        self._items[item.name] = item
+
+    def remove(self, item: Item) -> None:
+        del self._items[item.name]
+
+    def get(self, item_name: str) -> Item | None:
+        return self._items.get(item_name)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
 class ItemNotFoundException(Exception):
     pass
 
 
 @dataclass
 class ShoppingCart:
-    items: list[Item] = field(default_factory=list)
+    items: Iterable[Item] | ItemIndex = field(default_factory=ItemIndex)
     discount_code: Union[str, None] = None
+    # The items as an ItemIndex, set from items by __post_init__.
+    _items: ItemIndex = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.items = self._items = ItemIndex(self.items)
 
     @property
-    def total(self) -> Decimal:
-        return Decimal(sum(item.subtotal for item in self.items))
+    def total(self) -> Money:
+        return Money(
+            sum(item.price.minor_units * item.quantity for item in self._items)
+        )
+
+    def summary(self) -> list[tuple[str, Money]]:
+        return [("Total", self.total)]
+
+    def render(
+        self, format: str = "text", out: Optional[TextIO] = None
+    ) -> Optional[str]:
+        return render_receipt(self._items, self.summary(), format, out)
 
     def display(self) -> None:
-        # Print the cart
-        print("Shopping Cart:")
-        print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
-        for item in self.items:
-            item.print_item()
-        print("=" * 40)
-        print(f"Total: ${self.total:>7.2f}")
+        print_receipt(self._items, self.summary())
 
     def add_item(self, item: Item):
-        self.items.append(item)
+        self._items.append(item)
 
     def remove_item(self, item_name: str) -> None:
         found_item = self.find_item(item_name)
-        self.items.remove(found_item)
+        self._items.remove(found_item)
 
     def find_item(self, item_name: str) -> Item:
-        for item in self.items:
-            if item.name == item_name:
-                return item
+        item = self._items.get(item_name)
+        if item is not None:
+            return item
         raise ItemNotFoundException(f"Item {item_name} not found in cart")
 
     def update_item_quantity(self, item_name: str, quantity: int) -> None:
         item = self.find_item(item_name)
         item.set_quantity(quantity)
 
-    def update_item_price(self, item_name: str, price: Decimal) -> None:
+    def update_item_price(self, item_name: str, price: Money | Decimal) -> None:
         item = self.find_item(item_name)
         item.set_price(price)
 
@@ -74,9 +123,9 @@ def main() -> None:
     # Create a shopping cart and add some items to it
     cart = ShoppingCart(
         items=[
-            Item("Apple", Decimal("1.5"), 10),
-            Item("Banana", Decimal("2"), 2),
-            Item("Pizza", Decimal("11.90"), 5),
+            Item("Apple", to_money(Decimal("1.5")), 10),
+            Item("Banana", to_money(Decimal("2")), 2),
+            Item("Pizza", to_money(Decimal("11.90")), 5),
         ],
     )
 
@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Iterable
+
+DEFAULT_PLACES = 2  # cents
+
+
+@dataclass(frozen=True, slots=True, order=True)
+class Money:
+    """An amount of money as an integer number of minor units (cents by default).
+
+    Adding amounts and multiplying them by quantities are exact integer operations.
+    Only applying a rate can produce fractions of a minor unit; those are rounded
+    half to even unless another rounding mode is given.
+    """
+
+    minor_units: int = 0
+    places: int = DEFAULT_PLACES
+
+    @classmethod
+    def from_decimal(
+        cls,
+        amount: Decimal | int | str,
+        places: int = DEFAULT_PLACES,
+        rounding: str = ROUND_HALF_EVEN,
+    ) -> "Money":
+        minor_units = Decimal(amount).scaleb(places).to_integral_value(rounding)
+        return cls(int(minor_units), places)
+
+    @classmethod
+    def sum(cls, amounts: Iterable["Money"], places: int = DEFAULT_PLACES) -> "Money":
+        total = 0
+        for amount in amounts:
+            if amount.places != places:
+                raise ValueError("Can't add amounts with different minor units.")
+            total += amount.minor_units
+        return cls(total, places)
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.minor_units).scaleb(-self.places)
+
+    def percentage(self, rate: Decimal, rounding: str = ROUND_HALF_EVEN) -> "Money":
+        return Money.from_decimal(self.to_decimal() * rate, self.places, rounding)
+
+    def __add__(self, other: "Money") -> "Money":
+        self._check_places(other)
+        return Money(self.minor_units + other.minor_units, self.places)
+
+    def __radd__(self, other: "Money | int") -> "Money":
+        if other == 0:  # so the builtin sum() works
+            return self
+        return self + other  # type: ignore
+
+    def __sub__(self, other: "Money") -> "Money":
+        self._check_places(other)
+        return Money(self.minor_units - other.minor_units, self.places)
+
+    def __neg__(self) -> "Money":
+        return Money(-self.minor_units, self.places)
+
+    def __mul__(self, quantity: int) -> "Money":
+        if not isinstance(quantity, int):
+            return NotImplemented
+        return Money(self.minor_units * quantity, self.places)
+
+    __rmul__ = __mul__
+
+    def __bool__(self) -> bool:
+        return self.minor_units != 0
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.to_decimal(), format_spec)
+
+    def __str__(self) -> str:
+        return str(self.to_decimal())
+
+    def _check_places(self, other: "Money") -> None:
+        if not isinstance(other, Money):
+            raise TypeError(f"Can't combine Money with {type(other).__name__}.")
+        if other.places != self.places:
+            raise ValueError("Can't combine amounts with different minor units.")
+
+
+def to_money(amount: "Money | Decimal") -> Money:
+    """Converts a price to Money in cents.
+
+    Cart and order totals add up prices as cents, so Money with other minor units
+    is rejected rather than being added as if it were cents, and so are Decimals
+    with fractions of a cent rather than being rounded.
+    """
+    if not isinstance(amount, Money):
+        money = Money.from_decimal(amount)
+        if money.to_decimal() != amount:
+            raise ValueError(f"Prices must be whole cents, got {amount}.")
+        return money
+    if amount.places != DEFAULT_PLACES:
+        raise ValueError("Prices must be in cents.")
+    return amount
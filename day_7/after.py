@@ -1,24 +1,77 @@
 from dataclasses import dataclass, field
 from decimal import Decimal
 from enum import Enum, auto
-from typing import Optional
+from typing import Iterable, Iterator, Optional, TextIO
+
+from cart_codec import (
+    CartLine,
+    CartRecord,
+    encode_cart,
+    encode_delta,
+    encode_json,
+    load_cart,
+)
+from item_table import CartItem, ItemTable
+from money import Money, to_money
+from receipt import print_receipt, render_receipt
 
 
 class ItemNotFoundException(Exception):
     pass
 
 
-@dataclass
+class InconsistentCartException(Exception):
+    pass
+
+
+@dataclass(slots=True)
 class Item:
     name: str
-    price: Decimal
+    price: Money
     quantity: int
 
+    def __post_init__(self) -> None:
+        self.price = to_money(self.price)
+
     @property
-    def subtotal(self) -> Decimal:
+    def subtotal(self) -> Money:
         return self.price * self.quantity
 
 
+class ItemIndex:
+    """Items in insertion order, indexed by name for O(1) lookups and removals."""
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self._items: dict[str, Item] = {}
+        for item in items:
+            self.append(item)
+
+    def append(self, item: Item) -> None:
+        if item.name in self._items:
+            raise ValueError(f"Item '{item.name}' is already in the cart.")
+        self._items[item.name] = item
+
+    def remove(self, item: CartItem) -> None:
+        del self._items[item.name]
+
+    def get(self, item_name: str) -> Item | None:
+        return self._items.get(item_name)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
 class DiscountType(Enum):
     PERCENTAGE = auto()
     AMOUNT = auto()
@@ -30,58 +83,153 @@ class DiscountCode:
     discount_value: Decimal
     discount_type: DiscountType
 
-    def get_discounted_price(self, amount: Decimal) -> Decimal:
+    def get_discounted_price(self, amount: Money) -> Money:
         if self.discount_type == DiscountType.PERCENTAGE:
-            return amount * self.discount_value
+            return amount.percentage(self.discount_value)
         if self.discount_type == DiscountType.AMOUNT:
-            return amount - (amount - self.discount_value)
+            return Money.from_decimal(self.discount_value, amount.places)
         raise ValueError("Invalid discount type")
 
 
 @dataclass
 class ShoppingCart:
-    items: list[Item] = field(default_factory=list)
+    """Shopping cart that keeps a running subtotal, so reading totals is O(1).
+
+    Change items through the cart methods to keep the subtotal up to date, or call
+    recalculate() after changing items directly. With check_consistency, every
+    read of the subtotal verifies it against a full recalculation.
+    """
+
+    items: Iterable[Item] | ItemIndex | ItemTable = field(default_factory=ItemIndex)
     discount_code: Optional[DiscountCode] = None
+    check_consistency: bool = field(default=False, repr=False, compare=False)
+    # The items as an ItemIndex or ItemTable, set from items by __post_init__.
+    _items: ItemIndex | ItemTable = field(init=False, repr=False, compare=False)
+    _subtotal: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        items = self.items
+        if not isinstance(items, (ItemIndex, ItemTable)):
+            items = ItemIndex(items)
+        self.items = self._items = items
+        self.recalculate()
 
     def add_item(self, item: Item) -> None:
-        self.items.append(item)
+        self._items.append(item)
+        self._subtotal += item.price.minor_units * item.quantity
 
     def remove_item(self, item_name: str) -> None:
         found_item = self.find_item(item_name)
-        self.items.remove(found_item)
-
-    def find_item(self, item_name: str) -> Item:
-        for item in self.items:
-            if item.name == item_name:
-                return item
+        self._subtotal -= found_item.price.minor_units * found_item.quantity
+        self._items.remove(found_item)
+
+    def update_item_quantity(self, item_name: str, quantity: int) -> None:
+        item = self.find_item(item_name)
+        self._subtotal += item.price.minor_units * (quantity - item.quantity)
+        item.quantity = quantity
+
+    def update_item_price(self, item_name: str, price: Money | Decimal) -> None:
+        item = self.find_item(item_name)
+        price = to_money(price)
+        self._subtotal += (price.minor_units - item.price.minor_units) * item.quantity
+        item.price = price
+
+    def find_item(self, item_name: str) -> CartItem:
+        item = self._items.get(item_name)
+        if item is not None:
+            return item
         raise ItemNotFoundException(f"Item '{item_name}' not found.")
 
+    def recalculate(self) -> None:
+        self._subtotal = self._calculate_subtotal()
+
+    def _calculate_subtotal(self) -> int:
+        return sum(item.price.minor_units * item.quantity for item in self._items)
+
     @property
-    def subtotal(self) -> Decimal:
-        return Decimal(sum(item.subtotal for item in self.items))
+    def subtotal(self) -> Money:
+        if self.check_consistency:
+            expected = self._calculate_subtotal()
+            if expected != self._subtotal:
+                raise InconsistentCartException(
+                    f"Running subtotal {Money(self._subtotal)} doesn't match {Money(expected)}."
+                )
+        return Money(self._subtotal)
 
     @property
-    def discount(self) -> Decimal:
+    def discount(self) -> Money:
         if not self.discount_code:
-            return Decimal("0")
+            return Money()
         return self.discount_code.get_discounted_price(self.subtotal)
 
     @property
-    def total(self) -> Decimal:
+    def total(self) -> Money:
         return self.subtotal - self.discount
 
+    def summary(self) -> list[tuple[str, Money]]:
+        subtotal = self.subtotal
+        discount = self.discount
+        return [
+            ("Subtotal", subtotal),
+            ("Discount", discount),
+            ("Total", subtotal - discount),
+        ]
+
+    def render(
+        self, format: str = "text", out: Optional[TextIO] = None
+    ) -> Optional[str]:
+        return render_receipt(self._items, self.summary(), format, out)
+
     def display(self) -> None:
-        # Print the cart
-        print("Shopping Cart:")
-        print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
-        for item in self.items:
-            print(
-                f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"
+        print_receipt(self._items, self.summary())
+
+    def lines(self) -> Iterator[CartLine]:
+        return (
+            (item.name, ItemTable.to_cents(item.price), item.quantity)
+            for item in self._items
+        )
+
+    def _codes(self) -> list[str]:
+        if not self.discount_code:
+            return []
+        code = self.discount_code
+        return [code.code, str(code.discount_value), code.discount_type.name]
+
+    def to_bytes(self, format: str = "binary") -> bytes:
+        if format == "json":
+            return encode_json(self.lines(), self._codes())
+        return encode_cart(self.lines(), self._codes())
+
+    def delta_since(self, base: CartRecord) -> bytes:
+        """Encodes only what changed since the cart was saved as base."""
+        return encode_delta(base, self.lines(), self._codes())
+
+    @classmethod
+    def from_record(
+        cls, record: CartRecord, compact: bool = False, **kwargs
+    ) -> "ShoppingCart":
+        """Builds a cart from a decoded one, with an ItemTable if compact."""
+        items: ItemIndex | ItemTable
+        if compact:
+            items = ItemTable.from_columns(
+                record.names, record.prices, record.quantities
             )
-        print("=" * 40)
-        print(f"Subtotal: ${self.subtotal:>7.2f}")
-        print(f"Discount: ${self.discount:>7.2f}")
-        print(f"Total:    ${self.total:>7.2f}")
+        else:
+            items = ItemIndex(
+                Item(name, Money(price), quantity)
+                for name, price, quantity in record.lines()
+            )
+        discount_code = None
+        if record.codes:
+            code, value, discount_type = record.codes
+            discount_code = DiscountCode(
+                code, Decimal(value), DiscountType[discount_type]
+            )
+        return cls(items=items, discount_code=discount_code, **kwargs)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, compact: bool = False, **kwargs) -> "ShoppingCart":
+        return cls.from_record(load_cart(data), compact, **kwargs)
 
 
 def main() -> None:
@@ -89,9 +237,9 @@ def main() -> None:
     discount_code = DiscountCode("SAVE10", Decimal("0.1"), DiscountType.AMOUNT)
     cart = ShoppingCart(
         items=[
-            Item("Apple", Decimal("1.50"), 10),
-            Item("Banana", Decimal("2.00"), 2),
-            Item("Pizza", Decimal("11.90"), 5),
+            Item("Apple", to_money(Decimal("1.50")), 10),
+            Item("Banana", to_money(Decimal("2.00")), 2),
+            Item("Pizza", to_money(Decimal("11.90")), 5),
         ],
         discount_code=discount_code,
     )
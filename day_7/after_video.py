@@ -1,19 +1,26 @@
 from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import Optional, TextIO
+
+from money import Money, to_money
+from receipt import print_receipt, render_receipt
 
 
 class ItemNotFoundException(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     name: str
-    price: Decimal
+    price: Money
     quantity: int
 
+    def __post_init__(self) -> None:
+        self.price = to_money(self.price)
+
     @property
-    def subtotal(self) -> Decimal:
+    def subtotal(self) -> Money:
         return self.price * self.quantity
 
 
@@ -58,36 +65,42 @@ class ShoppingCart:
         self.discounts.remove(code)
 
     @property
-    def subtotal(self) -> Decimal:
-        return Decimal(sum(item.subtotal for item in self.items))
+    def subtotal(self) -> Money:
+        return Money(
+            sum(item.price.minor_units * item.quantity for item in self.items)
+        )
 
     @property
-    def discount(self) -> Decimal:
-        total_discount = Decimal("0")
+    def discount(self) -> Money:
+        subtotal = self.subtotal
+        total_discount = Money()
         for code in self.discounts:
             if code in DISCOUNTS:
                 discount = DISCOUNTS[code]
-                total_discount += discount.amount + (
-                    self.subtotal * discount.percentage
-                )
+                total_discount += Money.from_decimal(discount.amount)
+                total_discount += subtotal.percentage(discount.percentage)
         return total_discount
 
     @property
-    def total(self) -> Decimal:
+    def total(self) -> Money:
         return self.subtotal - self.discount
 
+    def summary(self) -> list[tuple[str, Money]]:
+        subtotal = self.subtotal
+        discount = self.discount
+        return [
+            ("Subtotal", subtotal),
+            ("Discount", discount),
+            ("Total", subtotal - discount),
+        ]
+
+    def render(
+        self, format: str = "text", out: Optional[TextIO] = None
+    ) -> Optional[str]:
+        return render_receipt(self.items, self.summary(), format, out)
+
     def display(self) -> None:
-        # Print the cart
-        print("Shopping Cart:")
-        print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
-        for item in self.items:
-            print(
-                f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"
-            )
-        print("=" * 40)
-        print(f"Subtotal: ${self.subtotal:>7.2f}")
-        print(f"Discount: ${self.discount:>7.2f}")
-        print(f"Total:    ${self.total:>7.2f}")
+        print_receipt(self.items, self.summary())
 
 
 def main() -> None:
@@ -95,9 +108,9 @@ def main() -> None:
     discount_code = "SAVE10"
     cart = ShoppingCart(
         items=[
-            Item("Apple", Decimal("1.50"), 10),
-            Item("Banana", Decimal("2.00"), 2),
-            Item("Pizza", Decimal("11.90"), 5),
+            Item("Apple", to_money(Decimal("1.50")), 10),
+            Item("Banana", to_money(Decimal("2.00")), 2),
+            Item("Pizza", to_money(Decimal("11.90")), 5),
         ],
     )
     cart.apply_discount(discount_code)
@@ -0,0 +1,56 @@
+import random
+import sys
+from decimal import Decimal
+from timeit import default_timer as timer
+
+from after import Item, ShoppingCart
+from money import to_money
+
+DEFAULT_SIZES = [1_000, 10_000, 50_000]
+LOOKUPS = 1_000
+
+
+def find_item_by_scan(items: list[Item], item_name: str) -> Item:
+    """The previous implementation: a linear scan by name."""
+    for item in items:
+        if item.name == item_name:
+            return item
+    raise KeyError(item_name)
+
+
+def benchmark(size: int) -> None:
+    rng = random.Random(42)
+    items = [Item(f"item{i}", to_money(Decimal("1.99")), 1) for i in range(size)]
+    cart = ShoppingCart(items=items)
+    names = [f"item{rng.randrange(size)}" for _ in range(LOOKUPS)]
+    removed = rng.sample(names, len(set(names)) // 2)
+
+    start = timer()
+    for name in names:
+        find_item_by_scan(items, name)
+    for name in set(removed):
+        items.remove(find_item_by_scan(items, name))
+    scan_time = timer() - start
+
+    start = timer()
+    for name in names:
+        cart.find_item(name)
+    for name in set(removed):
+        cart.remove_item(name)
+    index_time = timer() - start
+
+    print(
+        f"{size:>8,} items  list scan {scan_time * 1000:>9.1f}ms  "
+        f"index {index_time * 1000:>7.1f}ms  ({scan_time / index_time:,.0f}x faster)"
+    )
+
+
+def main() -> None:
+    # usage: python benchmark_cart.py [size ...]
+    print(f"{LOOKUPS:,} lookups and up to {LOOKUPS // 2:,} removals by name")
+    for size in [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES:
+        benchmark(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import pickle
+import sys
+from decimal import Decimal
+from timeit import default_timer as timer
+from typing import Callable
+
+from after import DiscountCode, DiscountType, Item, ShoppingCart
+from cart_codec import apply_delta, decode_cart, decode_delta
+from money import to_money
+
+DEFAULT_SIZES = [10, 1_000, 100_000]
+
+
+def best_of(func: Callable[[], object], repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = timer()
+        func()
+        timings.append(timer() - start)
+    return min(timings)
+
+
+def benchmark(size: int) -> None:
+    cart = ShoppingCart(
+        items=[
+            Item(f"item{i}", to_money(Decimal(i % 1000) / 4), i % 7 + 1)
+            for i in range(size)
+        ],
+        discount_code=DiscountCode("SAVE10", Decimal("0.1"), DiscountType.AMOUNT),
+    )
+    encoded = {
+        "pickle": pickle.dumps(cart),
+        "json": cart.to_bytes("json"),
+        "binary": cart.to_bytes(),
+    }
+
+    # Round trips
+    assert pickle.loads(encoded["pickle"]).items == cart.items
+    for format in ("json", "binary"):
+        for compact in (False, True):
+            decoded = ShoppingCart.from_bytes(encoded[format], compact)
+            assert decoded.items == cart.items and decoded.total == cart.total
+
+    print(f"{size:,} items")
+    binary = encoded["binary"]
+    rows = [
+        ("pickle", lambda: pickle.dumps(cart), lambda: pickle.loads(encoded["pickle"])),
+        (
+            "json",
+            lambda: cart.to_bytes("json"),
+            lambda: ShoppingCart.from_bytes(encoded["json"]),
+        ),
+        ("binary", cart.to_bytes, lambda: ShoppingCart.from_bytes(binary)),
+        (
+            "binary, compact",
+            cart.to_bytes,
+            lambda: ShoppingCart.from_bytes(binary, compact=True),
+        ),
+        ("binary, view only", cart.to_bytes, lambda: decode_cart(binary)),
+    ]
+    for name, encode, decode in rows:
+        size_name = name.split(",")[0]
+        print(
+            f"  {name:<18}{len(encoded[size_name]):>12,} bytes  "
+            f"encode {best_of(encode) * 1000:>8.2f}ms  "
+            f"decode {best_of(decode) * 1000:>8.2f}ms"
+        )
+
+    # Session store: save one edit as a delta against the saved cart
+    base = decode_cart(encoded["binary"])
+    cart.update_item_quantity("item0", 42)
+    delta = cart.delta_since(base)
+    updated = ShoppingCart.from_record(apply_delta(base, decode_delta(delta)))
+    assert updated.items == cart.items
+    print(
+        f"  {'delta of one edit':<18}{len(delta):>12,} bytes  "
+        f"encode {best_of(lambda: cart.delta_since(base)) * 1000:>8.2f}ms"
+    )
+
+
+def main() -> None:
+    # usage: python benchmark_cart_codec.py [size ...]
+    for size in [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES:
+        benchmark(size)
+
+
+if __name__ == "__main__":
+    main()
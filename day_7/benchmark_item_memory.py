@@ -0,0 +1,103 @@
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import partial
+from typing import Any, Callable
+
+from after import Item, ItemIndex
+from item_table import ItemTable
+from money import Money, to_money
+
+DEFAULT_CARTS = 100_000
+ITEMS_PER_CART = 5
+PRODUCTS = 1_000
+LARGE_CART = 1_000_000
+
+# A row is (product number, quantity); the builders create the names and prices,
+# like loading carts from a session store does.
+Row = tuple[int, int]
+
+
+@dataclass
+class DecimalItem:
+    """The original item: a regular dataclass with a Decimal price."""
+
+    name: str
+    price: Decimal
+    quantity: int
+
+
+@dataclass
+class MoneyItem:
+    name: str
+    price: Money
+    quantity: int
+
+
+def name(product: int) -> str:
+    return f"product{product}"
+
+
+def price(product: int) -> Decimal:
+    return Decimal(product % 500) / 4 + 1
+
+
+def build_carts(
+    build: Callable[[list[Row]], Any], cart_rows: list[list[Row]]
+) -> list[Any]:
+    return [build(rows) for rows in cart_rows]
+
+
+def measure(build: Callable[[], Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    result = build()  # pylint: disable=unused-variable
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+CONTAINERS: dict[str, Callable[[list[Row]], Any]] = {
+    "list of dataclass, Decimal": lambda rows: [
+        DecimalItem(name(product), price(product), quantity)
+        for product, quantity in rows
+    ],
+    "list of dataclass, Money": lambda rows: [
+        MoneyItem(name(product), Money.from_decimal(price(product)), quantity)
+        for product, quantity in rows
+    ],
+    "ItemIndex of slotted Item": lambda rows: ItemIndex(
+        Item(name(product), to_money(price(product)), quantity)
+        for product, quantity in rows
+    ),
+    "ItemTable": lambda rows: ItemTable(
+        Item(name(product), to_money(price(product)), quantity)
+        for product, quantity in rows
+    ),
+}
+
+
+def main() -> None:
+    # usage: python benchmark_item_memory.py [number of carts]
+    carts = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CARTS
+    cart_rows = [
+        [((cart * ITEMS_PER_CART + i) % PRODUCTS, i + 1) for i in range(ITEMS_PER_CART)]
+        for cart in range(carts)
+    ]
+    large_rows = [(product, product % 9 + 1) for product in range(LARGE_CART)]
+
+    print(f"{carts:,} carts of {ITEMS_PER_CART} items / one cart of {LARGE_CART:,}")
+    for label, build in CONTAINERS.items():
+        small = measure(partial(build_carts, build, cart_rows))
+        large = measure(partial(build, large_rows))
+        print(
+            f"{label:<28}{small / carts:>8,.0f} bytes per cart  "
+            f"{large / LARGE_CART:>6,.1f} bytes per item"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import random
+import sys
+from decimal import Decimal
+from timeit import default_timer as timer
+
+from after import Item, ShoppingCart
+from money import Money, to_money
+
+DEFAULT_LINES = 1_000_000
+
+
+def decimal_subtotal(prices: list[Decimal], quantities: list[int]) -> Decimal:
+    """The previous implementation: Decimal line totals summed from int 0."""
+    return Decimal(sum(price * quantity for price, quantity in zip(prices, quantities)))
+
+
+def main() -> None:
+    # usage: python benchmark_money.py [lines], e.g. 10000000
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    rng = random.Random(42)
+    prices = [Decimal(rng.randint(1, 100_000)) / 100 for _ in range(lines)]
+    quantities = [rng.randint(1, 10) for _ in range(lines)]
+    cart = ShoppingCart(
+        items=[
+            Item(f"item{i}", to_money(price), quantity)
+            for i, (price, quantity) in enumerate(zip(prices, quantities))
+        ]
+    )
+
+    start = timer()
+    expected = decimal_subtotal(prices, quantities)
+    decimal_time = timer() - start
+
+    # cart.subtotal is kept up to date as items change, so time the sum itself.
+    start = timer()
+    subtotal = Money(cart._calculate_subtotal())  # pylint: disable=protected-access
+    money_time = timer() - start
+
+    assert subtotal.to_decimal() == expected
+    print(f"{lines:,} lines, subtotal {subtotal}")
+    print(f"Decimal:      {decimal_time:.3f}s")
+    print(f"Money (int):  {money_time:.3f}s  ({decimal_time / money_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
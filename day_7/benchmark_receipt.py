@@ -0,0 +1,62 @@
+import contextlib
+import os
+import sys
+from decimal import Decimal
+from timeit import default_timer as timer
+
+from after import Item, ShoppingCart
+from money import to_money
+
+DEFAULT_SIZES = [100, 10_000, 200_000]
+
+
+def display_line_by_line(cart: ShoppingCart) -> None:
+    """The previous implementation: one print per line, totals read as needed."""
+    print("Shopping Cart:")
+    print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
+    for item in cart.items:
+        print(
+            f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"
+        )
+    print("=" * 40)
+    print(f"Subtotal: ${cart.subtotal:>7.2f}")
+    print(f"Discount: ${cart.discount:>7.2f}")
+    print(f"Total:    ${cart.total:>7.2f}")
+
+
+def benchmark(size: int) -> None:
+    cart = ShoppingCart(
+        items=[
+            Item(f"item{i}", to_money(Decimal(i % 1000) / 4), i % 7 + 1)
+            for i in range(size)
+        ]
+    )
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        timings = {}
+        with contextlib.redirect_stdout(devnull):
+            start = timer()
+            display_line_by_line(cart)
+            timings["print per line"] = timer() - start
+        for format in ("text", "csv", "json"):
+            start = timer()
+            cart.render(format, out=devnull)
+            timings[format] = timer() - start
+
+    baseline = timings["print per line"]
+    print(
+        f"{size:>9,} items  "
+        + "  ".join(
+            f"{name} {elapsed * 1000:>8.1f}ms ({baseline / elapsed:.1f}x)"
+            for name, elapsed in timings.items()
+        )
+    )
+
+
+def main() -> None:
+    # usage: python benchmark_receipt.py [size ...]
+    for size in [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES:
+        benchmark(size)
+
+
+if __name__ == "__main__":
+    main()
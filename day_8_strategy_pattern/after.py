@@ -1,23 +1,88 @@
-from typing import Protocol
+from typing import (
+    Callable,
+    ClassVar,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Protocol,
+    TextIO,
+)
 from dataclasses import dataclass, field
 from decimal import Decimal
 
-
-@dataclass
+from cart_codec import (
+    CartLine,
+    CartRecord,
+    encode_cart,
+    encode_delta,
+    encode_json,
+    load_cart,
+)
+from catalog import DiscountCatalog, InMemoryCatalog
+from discounts import Discount, DiscountPlan
+from gateway import (
+    CHECKOUT_CART_ID,
+    LOCAL_GATEWAY,
+    Credentials,
+    Gateway,
+    Payment,
+    PaymentError,
+    PaymentResult,
+    check_credentials,
+    check_results,
+)
+from item_table import CartItem, ItemTable
+from money import Money, to_money
+from receipt import print_receipt, render_receipt
+
+
+@dataclass(slots=True)
 class Item:
     name: str
-    price: Decimal
+    price: Money
     quantity: int
 
+    def __post_init__(self) -> None:
+        self.price = to_money(self.price)
+
     @property
-    def subtotal(self) -> Decimal:
+    def subtotal(self) -> Money:
         return self.price * self.quantity
 
 
-@dataclass
-class Discount:
-    amount: Decimal
-    percentage: Decimal
+class ItemIndex:
+    """Items in insertion order, indexed by name for O(1) lookups and removals."""
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self._items: dict[str, Item] = {}
+        for item in items:
+            self.append(item)
+
+    def append(self, item: Item) -> None:
+        if item.name in self._items:
+            raise ValueError(f"Item '{item.name}' is already in the cart.")
+        self._items[item.name] = item
+
+    def remove(self, item: CartItem) -> None:
+        del self._items[item.name]
+
+    def get(self, item_name: str) -> Item | None:
+        return self._items.get(item_name)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
 
 
 DISCOUNTS = {
@@ -25,7 +90,12 @@ DISCOUNTS = {
     "5BUCKSOFF": Discount(amount=Decimal("5.00"), percentage=Decimal("0")),
     "FREESHIPPING": Discount(amount=Decimal("2.00"), percentage=Decimal("0")),
     "BLKFRIDAY": Discount(amount=Decimal("0"), percentage=Decimal("0.2")),
+    "PIZZAPARTY": Discount(
+        percentage=Decimal("0.25"), cap=Decimal("10.00"), items=frozenset({"Pizza"})
+    ),
+    "LOYALTY5": Discount(percentage=Decimal("0.05"), priority=10, compound=True),
 }
+DEFAULT_CATALOG = InMemoryCatalog(DISCOUNTS)
 
 
 class PaymentStrategy(Protocol):
@@ -33,7 +103,58 @@ class PaymentStrategy(Protocol):
         ...
 
 
-class CreditCardPaymentStrategy:
+class BatchPaymentStrategy(Protocol):
+    def pay_batch(
+        self, credentials: Credentials, payments: list[Payment]
+    ) -> list[PaymentResult]:
+        ...
+
+    async def pay_batch_async(
+        self, credentials: Credentials, payments: list[Payment]
+    ) -> list[PaymentResult]:
+        ...
+
+
+@dataclass
+class GatewayPaymentStrategy:
+    """Pays batches of carts through a gateway, with pre-collected credentials.
+
+    The pay() method of the subclasses is the interactive flow on top of that: it
+    asks for the credentials and pays a single total.
+    """
+
+    method: ClassVar[str]
+    required_credentials: ClassVar[tuple[str, ...]]
+    gateway: Gateway = LOCAL_GATEWAY
+
+    def pay_batch(
+        self, credentials: Credentials, payments: list[Payment]
+    ) -> list[PaymentResult]:
+        check_credentials(credentials, self.required_credentials)
+        return self.gateway.charge_batch(self.method, credentials, payments)
+
+    async def pay_batch_async(
+        self, credentials: Credentials, payments: list[Payment]
+    ) -> list[PaymentResult]:
+        check_credentials(credentials, self.required_credentials)
+        return await self.gateway.charge_batch_async(
+            self.method, credentials, payments
+        )
+
+    def pay_checkout(self, credentials: Credentials, amount: Decimal) -> None:
+        """Pays a single total, raising PaymentError if it's declined."""
+        check_results(self.pay_batch(credentials, [(CHECKOUT_CART_ID, amount)]))
+
+
+@dataclass
+class CreditCardPaymentStrategy(GatewayPaymentStrategy):
+    method: ClassVar[str] = "credit_card"
+    required_credentials: ClassVar[tuple[str, ...]] = (
+        "card_number",
+        "expiration_date",
+        "ccv",
+    )
+
     def pay(self, amount: Decimal) -> None:
         card_number = input("Please enter your credit card number: ")
         expiration_date = input("Please enter your credit card expiration date: ")
@@ -43,18 +164,33 @@ class CreditCardPaymentStrategy:
         print(
             f"Processing credit card payment of ${amount:.2f} with card number {card_number_masked} and expiration date {expiration_date} and CCV {ccv_masked}..."
         )
+        credentials = {
+            "card_number": card_number,
+            "expiration_date": expiration_date,
+            "ccv": ccv,
+        }
+        self.pay_checkout(credentials, amount)
+
 
+@dataclass
+class ApplePaymentStrategy(GatewayPaymentStrategy):
+    method: ClassVar[str] = "apple_pay"
+    required_credentials: ClassVar[tuple[str, ...]] = ("device_id",)
 
-class ApplePaymentStrategy:
     def pay(self, amount: Decimal) -> None:
         device_id = input("Please enter your Apple Pay device ID: ")
         device_id_masked = device_id[-4:].rjust(len(device_id), "*")
         print(
             f"Processing Apple Pay payment of ${amount:.2f} with device ID {device_id_masked}..."
         )
+        self.pay_checkout({"device_id": device_id}, amount)
 
 
-class PaypalPaymentStrategy:
+@dataclass
+class PaypalPaymentStrategy(GatewayPaymentStrategy):
+    method: ClassVar[str] = "paypal"
+    required_credentials: ClassVar[tuple[str, ...]] = ("email", "password")
+
     def pay(self, amount: Decimal) -> None:
         email = input("Please enter your PayPal email address: ")
         password = input("Please enter your PayPal password: ")
@@ -62,79 +198,217 @@ class PaypalPaymentStrategy:
         print(
             f"Processing PayPal payment of ${amount:.2f} with email {email} and password {password_masked}..."
         )
+        credentials = {"email": email, "password": password}
+        self.pay_checkout(credentials, amount)
+
+
+class InconsistentCartException(Exception):
+    pass
 
 
 @dataclass
 class ShoppingCart:
-    items: list[Item] = field(default_factory=list)
+    """Shopping cart that keeps a running subtotal and caches its discount.
+
+    The applied discount codes are compiled into a DiscountPlan when they or the
+    catalog change, and the discount is only evaluated again after the cart
+    changed. Change items through the cart methods to keep the totals up to date,
+    or call recalculate() after changing items directly. With check_consistency,
+    every read of the totals verifies them against a full recalculation.
+    """
+
+    items: Iterable[Item] | ItemIndex | ItemTable = field(default_factory=ItemIndex)
     discounts: list[str] = field(default_factory=list)
+    catalog: DiscountCatalog = field(
+        default=DEFAULT_CATALOG, repr=False, compare=False
+    )
+    check_consistency: bool = field(default=False, repr=False, compare=False)
+    # The items as an ItemIndex or ItemTable, set from items by __post_init__.
+    _items: ItemIndex | ItemTable = field(init=False, repr=False, compare=False)
+    _subtotal: int = field(default=0, init=False, repr=False, compare=False)
+    _plan: DiscountPlan = field(
+        default=DiscountPlan(), init=False, repr=False, compare=False
+    )
+    _catalog_version: int = field(default=0, init=False, repr=False, compare=False)
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _cached_discount: tuple[int, Money] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        items = self.items
+        if not isinstance(items, (ItemIndex, ItemTable)):
+            items = ItemIndex(items)
+        self.items = self._items = items
+        self.recalculate()
 
     def add_item(self, item: Item) -> None:
-        self.items.append(item)
+        self._items.append(item)
+        self._subtotal += item.price.minor_units * item.quantity
+        self._version += 1
 
     def remove_item(self, item_name: str) -> None:
         found_item = self.find_item(item_name)
         if not found_item:
             print(f"Item '{item_name}' not in shopping cart, can't remove it!")
         else:
-            self.items.remove(found_item)
+            self._subtotal -= found_item.price.minor_units * found_item.quantity
+            self._items.remove(found_item)
+            self._version += 1
+
+    def update_item_quantity(self, item_name: str, quantity: int) -> None:
+        item = self.find_item(item_name)
+        if not item:
+            print(f"Item '{item_name}' not in shopping cart, can't update it!")
+            return
+        self._subtotal += item.price.minor_units * (quantity - item.quantity)
+        item.quantity = quantity
+        self._version += 1
+
+    def update_item_price(self, item_name: str, price: Money | Decimal) -> None:
+        item = self.find_item(item_name)
+        if not item:
+            print(f"Item '{item_name}' not in shopping cart, can't update it!")
+            return
+        price = to_money(price)
+        self._subtotal += (price.minor_units - item.price.minor_units) * item.quantity
+        item.price = price
+        self._version += 1
+
+    def find_item(self, item_name: str) -> CartItem | None:
+        return self._items.get(item_name)
 
-    def find_item(self, item_name: str) -> Item | None:
-        for item in self.items:
-            if item.name == item_name:
-                return item
-        return None
+    def recalculate(self) -> None:
+        self._subtotal = self._calculate_subtotal()
+        self._compile_plan()
+
+    def _calculate_subtotal(self) -> int:
+        return sum(item.price.minor_units * item.quantity for item in self._items)
+
+    def _compile_discounts(self) -> DiscountPlan:
+        discounts = (self.catalog.get(code) for code in self.discounts)
+        return DiscountPlan.compile(
+            discount for discount in discounts if discount is not None
+        )
+
+    def _compile_plan(self) -> None:
+        self._catalog_version = self.catalog.version
+        self._plan = self._compile_discounts()
+        self._version += 1
+
+    def _check_consistency(self) -> None:
+        if (
+            self._calculate_subtotal() != self._subtotal
+            or self._compile_discounts() != self._plan
+        ):
+            raise InconsistentCartException("Running totals don't match the cart.")
 
     @property
-    def subtotal(self) -> Decimal:
-        return Decimal(sum(item.subtotal for item in self.items))
+    def subtotal(self) -> Money:
+        if self.check_consistency:
+            self._check_consistency()
+        return Money(self._subtotal)
 
     @property
-    def total(self) -> Decimal:
+    def total(self) -> Money:
         return self.subtotal - self.discount
 
     def apply_discount(self, code: str) -> None:
-        if not code in DISCOUNTS:
+        if not code in self.catalog:
             print(f"Discount code '{code}' is not valid!")
             return
         self.discounts.append(code)
+        self._compile_plan()
 
     def remove_discount(self, code: str) -> None:
         self.discounts.remove(code)
+        self._compile_plan()
 
     @property
-    def discount(self) -> Decimal:
-        total_discount = Decimal("0")
-        for code in self.discounts:
-            if code in DISCOUNTS:
-                total_discount += DISCOUNTS[code].amount + (
-                    DISCOUNTS[code].percentage * self.subtotal
-                )
-        return total_discount
+    def discount(self) -> Money:
+        if self.catalog.version != self._catalog_version:
+            self._compile_plan()
+        subtotal = self.subtotal
+        if self._cached_discount and self._cached_discount[0] == self._version:
+            return self._cached_discount[1]
+        discount = self._plan.evaluate(self._items, subtotal)
+        self._cached_discount = (self._version, discount)
+        return discount
+
+    def summary(self) -> list[tuple[str, Money]]:
+        subtotal = self.subtotal
+        discount = self.discount
+        return [
+            ("Subtotal", subtotal),
+            ("Discount", discount),
+            ("Total", subtotal - discount),
+        ]
+
+    def render(
+        self, format: str = "text", out: Optional[TextIO] = None
+    ) -> Optional[str]:
+        return render_receipt(self._items, self.summary(), format, out)
 
     def display(self) -> None:
-        print("Shopping Cart:")
-        print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
-        for item in self.items:
-            print(
-                f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"
+        print_receipt(self._items, self.summary())
+
+    def lines(self) -> Iterator[CartLine]:
+        return (
+            (item.name, ItemTable.to_cents(item.price), item.quantity)
+            for item in self._items
+        )
+
+    def to_bytes(self, format: str = "binary") -> bytes:
+        if format == "json":
+            return encode_json(self.lines(), self.discounts)
+        return encode_cart(self.lines(), self.discounts)
+
+    def delta_since(self, base: CartRecord) -> bytes:
+        """Encodes only what changed since the cart was saved as base."""
+        return encode_delta(base, self.lines(), self.discounts)
+
+    @classmethod
+    def from_record(
+        cls, record: CartRecord, compact: bool = False, **kwargs
+    ) -> "ShoppingCart":
+        """Builds a cart from a decoded one, with an ItemTable if compact."""
+        items: ItemIndex | ItemTable
+        if compact:
+            items = ItemTable.from_columns(
+                record.names, record.prices, record.quantities
+            )
+        else:
+            items = ItemIndex(
+                Item(name, Money(price), quantity)
+                for name, price, quantity in record.lines()
             )
-        print("=" * 40)
-        print(f"Subtotal: ${self.subtotal:>7.2f}")
-        print(f"Discount: ${self.discount:>7.2f}")
-        print(f"Total:    ${self.total:>7.2f}")
+        return cls(items=items, discounts=list(record.codes), **kwargs)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, compact: bool = False, **kwargs) -> "ShoppingCart":
+        return cls.from_record(load_cart(data), compact, **kwargs)
 
     def process_payment(self, payment_strategy: PaymentStrategy) -> None:
-        payment_strategy.pay(self.total)
+        payment_strategy.pay(self.total.to_decimal())
+
+
+def pay_carts(
+    payment_strategy: BatchPaymentStrategy,
+    credentials: Credentials,
+    carts: Mapping[str, ShoppingCart],
+) -> list[PaymentResult]:
+    """Pays the total of every cart, by cart id, in one batch."""
+    payments = [(cart_id, cart.total.to_decimal()) for cart_id, cart in carts.items()]
+    return payment_strategy.pay_batch(credentials, payments)
 
 
 def main() -> None:
     # Create a shopping cart and add some items to it
     cart = ShoppingCart(
         items=[
-            Item("Apple", Decimal("1.50"), 10),
-            Item("Banana", Decimal("2.00"), 2),
-            Item("Pizza", Decimal("11.90"), 5),
+            Item("Apple", to_money(Decimal("1.50")), 10),
+            Item("Banana", to_money(Decimal("2.00")), 2),
+            Item("Pizza", to_money(Decimal("11.90")), 5),
         ],
     )
     cart.apply_discount("SAVE10")
@@ -145,14 +419,18 @@ def main() -> None:
     payment_type = input(
         "What payment method would you like to use? (cc/paypal/apple) "
     )
-    if payment_type == "cc":
-        cart.process_payment(CreditCardPaymentStrategy())
-    elif payment_type == "paypal":
-        cart.process_payment(PaypalPaymentStrategy())
-    elif payment_type == "apple":
-        cart.process_payment(ApplePaymentStrategy())
-    else:
+    strategies: dict[str, Callable[[], PaymentStrategy]] = {
+        "cc": CreditCardPaymentStrategy,
+        "paypal": PaypalPaymentStrategy,
+        "apple": ApplePaymentStrategy,
+    }
+    if payment_type not in strategies:
         print(f"Invalid payment type '{payment_type}'!")
+        return
+    try:
+        cart.process_payment(strategies[payment_type]())
+    except PaymentError as e:
+        print(f"Payment failed: {e}")
 
 
 if __name__ == "__main__":
@@ -1,16 +1,22 @@
-from typing import Callable
+from typing import Callable, Optional, TextIO
 from dataclasses import dataclass, field
 from decimal import Decimal
 
+from money import Money, to_money
+from receipt import print_receipt, render_receipt
 
-@dataclass
+
+@dataclass(slots=True)
 class Item:
     name: str
-    price: Decimal
+    price: Money
     quantity: int
 
+    def __post_init__(self) -> None:
+        self.price = to_money(self.price)
+
     @property
-    def subtotal(self) -> Decimal:
+    def subtotal(self) -> Money:
         return self.price * self.quantity
 
 
@@ -50,11 +56,13 @@ class ShoppingCart:
         return None
 
     @property
-    def subtotal(self) -> Decimal:
-        return Decimal(sum(item.subtotal for item in self.items))
+    def subtotal(self) -> Money:
+        return Money(
+            sum(item.price.minor_units * item.quantity for item in self.items)
+        )
 
     @property
-    def total(self) -> Decimal:
+    def total(self) -> Money:
         return self.subtotal - self.discount
 
     def apply_discount(self, code: str) -> None:
@@ -67,26 +75,32 @@ class ShoppingCart:
         self.discounts.remove(code)
 
     @property
-    def discount(self) -> Decimal:
-        total_discount = Decimal("0")
+    def discount(self) -> Money:
+        subtotal = self.subtotal
+        total_discount = Money()
         for code in self.discounts:
             if code in DISCOUNTS:
-                total_discount += DISCOUNTS[code].amount + (
-                    DISCOUNTS[code].percentage * self.subtotal
-                )
+                discount = DISCOUNTS[code]
+                total_discount += Money.from_decimal(discount.amount)
+                total_discount += subtotal.percentage(discount.percentage)
         return total_discount
 
+    def summary(self) -> list[tuple[str, Money]]:
+        subtotal = self.subtotal
+        discount = self.discount
+        return [
+            ("Subtotal", subtotal),
+            ("Discount", discount),
+            ("Total", subtotal - discount),
+        ]
+
+    def render(
+        self, format: str = "text", out: Optional[TextIO] = None
+    ) -> Optional[str]:
+        return render_receipt(self.items, self.summary(), format, out)
+
     def display(self) -> None:
-        print("Shopping Cart:")
-        print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
-        for item in self.items:
-            print(
-                f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"
-            )
-        print("=" * 40)
-        print(f"Subtotal: ${self.subtotal:>7.2f}")
-        print(f"Discount: ${self.discount:>7.2f}")
-        print(f"Total:    ${self.total:>7.2f}")
+        print_receipt(self.items, self.summary())
 
 
 def process_payment_cc(amount: Decimal) -> None:
@@ -141,9 +155,9 @@ def main() -> None:
     # Create a shopping cart and add some items to it
     cart = ShoppingCart(
         items=[
-            Item("Apple", Decimal("1.50"), 10),
-            Item("Banana", Decimal("2.00"), 2),
-            Item("Pizza", Decimal("11.90"), 5),
+            Item("Apple", to_money(Decimal("1.50")), 10),
+            Item("Banana", to_money(Decimal("2.00")), 2),
+            Item("Pizza", to_money(Decimal("11.90")), 5),
         ],
     )
     cart.apply_discount("SAVE10")
@@ -151,7 +165,7 @@ def main() -> None:
     # Print the total
     cart.display()
 
-    handle_payment(cart.total)
+    handle_payment(cart.total.to_decimal())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from decimal import Decimal
+from timeit import default_timer as timer
+
+from after import Item, ShoppingCart
+from catalog import SQLiteCatalog, write_discounts
+from discounts import Discount
+from money import to_money
+
+DEFAULT_SIZE = 1_000_000
+LOOKUPS = 100_000
+
+
+def generate_discounts(size: int):
+    for index in range(size):
+        if index % 2:
+            yield f"PROMO{index:08}", Discount(amount=Decimal(index % 50))
+        else:
+            yield f"PROMO{index:08}", Discount(percentage=Decimal(index % 30) / 100)
+
+
+def main() -> None:
+    # usage: python benchmark_catalog.py [number of codes]
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+    rng = random.Random(42)
+    path = os.path.join(tempfile.mkdtemp(), "discounts.db")
+
+    start = timer()
+    write_discounts(path, generate_discounts(size))
+    print(f"Wrote {size:,} codes in {timer() - start:.1f}s")
+
+    tracemalloc.start()
+    start = timer()
+    in_memory = dict(generate_discounts(size))
+    print(
+        f"dict catalog: loaded in {timer() - start:.2f}s, "
+        f"{tracemalloc.get_traced_memory()[0] / 2**20:,.0f} MiB"
+    )
+    del in_memory
+    tracemalloc.stop()
+
+    start = timer()
+    catalog = SQLiteCatalog(path)
+    print(f"SQLite catalog: opened in {(timer() - start) * 1000:.2f}ms")
+
+    # Mostly popular codes, a few random ones and some invalid ones.
+    popular = [f"PROMO{rng.randrange(size):08}" for _ in range(1_000)]
+    codes = [
+        rng.choice(popular)
+        if rng.random() < 0.9
+        else f"PROMO{rng.randrange(size * 2):08}"
+        for _ in range(LOOKUPS)
+    ]
+    start = timer()
+    for code in codes:
+        code in catalog  # pylint: disable=pointless-statement
+    elapsed = timer() - start
+    print(
+        f"{LOOKUPS:,} lookups: {elapsed / LOOKUPS * 1e6:.1f}us each, "
+        f"{catalog.hits / LOOKUPS:.0%} cache hits"
+    )
+
+    # Hot reload: another process changes a code, the cart picks it up.
+    catalog.check_interval = 0
+    cart = ShoppingCart(
+        items=[Item("Apple", to_money(Decimal("1.50")), 10)], catalog=catalog
+    )
+    cart.apply_discount("PROMO00000001")
+    print(f"Discount before update: ${cart.discount:.2f}")
+    write_discounts(path, [("PROMO00000001", Discount(amount=Decimal("3.00")))])
+    print(f"Discount after update:  ${cart.discount:.2f}")
+    catalog.close()
+
+
+if __name__ == "__main__":
+    main()
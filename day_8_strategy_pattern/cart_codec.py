@@ -0,0 +1,260 @@
+import json
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable, Iterator, Literal, Optional, Sequence
+
+MAGIC = b"CART"
+VERSION = 1
+SUPPORTED_VERSIONS = (1,)
+FULL = 0
+DELTA = 1
+
+# magic, version, kind, item count, code count (the header is 16 bytes, so the
+# price column that follows it is 8-byte aligned)
+HEADER = struct.Struct("<4sBBxxII")
+# magic, version, kind, upsert count, removal count, code count
+DELTA_HEADER = struct.Struct("<4sBBxxIII")
+
+CartLine = tuple[str, int, int]  # name, price in cents, quantity
+Typecode = Literal["i", "I", "q"]  # the integer columns in the binary format
+
+
+class CartFormatError(ValueError):
+    pass
+
+
+def _take(data: memoryview, offset: int, size: int) -> memoryview:
+    if offset + size > len(data):
+        raise CartFormatError("Truncated cart data.")
+    return data[offset : offset + size]
+
+
+def _column(data: memoryview, typecode: Typecode) -> "memoryview | array":
+    """A typed view on little-endian data, copied only on big-endian machines."""
+    if sys.byteorder == "little":
+        return data.cast(typecode)
+    column = array(typecode)
+    column.frombytes(data)
+    column.byteswap()
+    return column
+
+
+def _encode_strings(strings: Sequence[str]) -> bytes:
+    blobs = [string.encode() for string in strings]
+    offsets = array("I", [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    return offsets.tobytes() + b"".join(blobs)
+
+
+def _decode_strings(data: memoryview, offset: int, count: int) -> tuple[list[str], int]:
+    size = (count + 1) * 4
+    offsets = _column(_take(data, offset, size), "I")
+    blob = _take(data, offset + size, offsets[count])
+    strings = [str(blob[offsets[i] : offsets[i + 1]], "utf-8") for i in range(count)]
+    return strings, offset + size + offsets[count]
+
+
+def _check_header(data: memoryview, header: struct.Struct, kind: int) -> tuple:
+    if len(data) < header.size:
+        raise CartFormatError("Truncated cart data.")
+    fields = header.unpack_from(data)
+    magic, version, found_kind = fields[:3]
+    if magic != MAGIC:
+        raise CartFormatError("Not binary cart data.")
+    if version not in SUPPORTED_VERSIONS:
+        raise CartFormatError(f"Unsupported cart format version {version}.")
+    if found_kind != kind:
+        raise CartFormatError("Expected a full cart, got a delta, or vice versa.")
+    return fields[3:]
+
+
+@dataclass
+class CartRecord:
+    """A decoded cart.
+
+    Decoding binary data doesn't copy the price and quantity columns: they're
+    views on the encoded data, and names are only decoded when they're needed.
+    """
+
+    prices: Sequence[int]
+    quantities: Sequence[int]
+    codes: list[str]
+    _names: Optional[list[str]] = None
+    _name_offsets: Optional[Sequence[int]] = None
+    _name_blob: Optional[memoryview] = None
+    _rows: Optional[dict[str, int]] = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def name(self, row: int) -> str:
+        if self._names is not None:
+            return self._names[row]
+        offsets, blob = self._name_offsets, self._name_blob
+        return str(blob[offsets[row] : offsets[row + 1]], "utf-8")  # type: ignore
+
+    @property
+    def names(self) -> list[str]:
+        if self._names is None:
+            self._names = [self.name(row) for row in range(len(self))]
+        return self._names
+
+    @property
+    def rows(self) -> dict[str, int]:
+        if self._rows is None:
+            self._rows = {name: row for row, name in enumerate(self.names)}
+        return self._rows
+
+    def lines(self) -> Iterator[CartLine]:
+        return zip(self.names, self.prices, self.quantities)
+
+
+@dataclass
+class CartDelta:
+    upserts: list[CartLine]
+    removals: list[str]
+    codes: list[str]
+
+
+def encode_cart(lines: Iterable[CartLine], codes: Sequence[str] = ()) -> bytes:
+    names: list[str] = []
+    prices = array("q")
+    quantities = array("i")
+    for name, price, quantity in lines:
+        names.append(name)
+        prices.append(price)
+        quantities.append(quantity)
+    if sys.byteorder != "little":
+        prices.byteswap()
+        quantities.byteswap()
+    return b"".join(
+        (
+            HEADER.pack(MAGIC, VERSION, FULL, len(names), len(codes)),
+            prices.tobytes(),
+            quantities.tobytes(),
+            _encode_strings(names),
+            _encode_strings(codes),
+        )
+    )
+
+
+def decode_cart(data: bytes | memoryview) -> CartRecord:
+    view = memoryview(data)
+    count, code_count = _check_header(view, HEADER, FULL)
+    offset = HEADER.size
+    prices = _column(_take(view, offset, count * 8), "q")
+    offset += count * 8
+    quantities = _column(_take(view, offset, count * 4), "i")
+    offset += count * 4
+    name_offsets = _column(_take(view, offset, (count + 1) * 4), "I")
+    offset += (count + 1) * 4
+    name_blob = _take(view, offset, name_offsets[count])
+    codes, _ = _decode_strings(view, offset + name_offsets[count], code_count)
+    return CartRecord(
+        prices, quantities, codes, _name_offsets=name_offsets, _name_blob=name_blob
+    )
+
+
+def encode_delta(
+    base: CartRecord, lines: Iterable[CartLine], codes: Sequence[str] = ()
+) -> bytes:
+    """Encodes the lines that changed since the base cart, and the codes."""
+    rows = base.rows
+    seen = set()
+    upserts: list[CartLine] = []
+    for line in lines:
+        name, price, quantity = line
+        seen.add(name)
+        row = rows.get(name)
+        if row is None or base.prices[row] != price or base.quantities[row] != quantity:
+            upserts.append(line)
+    removals = [name for name in rows if name not in seen]
+
+    body = array("q")
+    for _, price, quantity in upserts:
+        body.append(price)
+        body.append(quantity)
+    if sys.byteorder != "little":
+        body.byteswap()
+    return b"".join(
+        (
+            DELTA_HEADER.pack(
+                MAGIC, VERSION, DELTA, len(upserts), len(removals), len(codes)
+            ),
+            body.tobytes(),
+            _encode_strings([name for name, _, _ in upserts]),
+            _encode_strings(removals),
+            _encode_strings(codes),
+        )
+    )
+
+
+def decode_delta(data: bytes | memoryview) -> CartDelta:
+    view = memoryview(data)
+    count, removal_count, code_count = _check_header(view, DELTA_HEADER, DELTA)
+    offset = DELTA_HEADER.size
+    body = array("q")
+    body.frombytes(_take(view, offset, count * 16))
+    if sys.byteorder != "little":
+        body.byteswap()
+    offset += count * 16
+    names, offset = _decode_strings(view, offset, count)
+    removals, offset = _decode_strings(view, offset, removal_count)
+    codes, _ = _decode_strings(view, offset, code_count)
+    upserts = [(name, body[2 * i], body[2 * i + 1]) for i, name in enumerate(names)]
+    return CartDelta(upserts, removals, codes)
+
+
+def apply_delta(base: CartRecord, delta: CartDelta) -> CartRecord:
+    """Returns the cart after the delta; changed lines keep their place."""
+    lines = {name: (price, quantity) for name, price, quantity in base.lines()}
+    for name in delta.removals:
+        if name not in lines:
+            raise CartFormatError(f"Delta removes '{name}', which isn't in the cart.")
+        del lines[name]
+    for name, price, quantity in delta.upserts:
+        lines[name] = (price, quantity)
+    return CartRecord(
+        array("q", (price for price, _ in lines.values())),
+        array("i", (quantity for _, quantity in lines.values())),
+        list(delta.codes),
+        _names=list(lines),
+    )
+
+
+def encode_json(lines: Iterable[CartLine], codes: Sequence[str] = ()) -> bytes:
+    # Prices are decimal strings, so the JSON is readable and stays exact.
+    items = [
+        [name, str(Decimal(price).scaleb(-2)), quantity]
+        for name, price, quantity in lines
+    ]
+    document = {"version": VERSION, "items": items, "codes": list(codes)}
+    return json.dumps(document).encode()
+
+
+def decode_json(data: bytes | str) -> CartRecord:
+    document = json.loads(data)
+    if document.get("version") not in SUPPORTED_VERSIONS:
+        raise CartFormatError(
+            f"Unsupported cart format version {document.get('version')}."
+        )
+    items = document["items"]
+    return CartRecord(
+        array("q", (int(Decimal(price).scaleb(2)) for _, price, _ in items)),
+        array("i", (quantity for _, _, quantity in items)),
+        document["codes"],
+        _names=[name for name, _, _ in items],
+    )
+
+
+def load_cart(data: bytes | memoryview) -> CartRecord:
+    """Decodes a full cart in either format."""
+    if bytes(data[:1]) == b"{":
+        return decode_json(bytes(data))
+    return decode_cart(data)
@@ -0,0 +1,167 @@
+import sys
+from array import array
+from typing import Iterable, Iterator, Optional, Protocol, Sequence
+
+from money import DEFAULT_PLACES, Money
+
+COMPACT_RATIO = 0.5  # compact the table once this fraction of rows is removed
+
+
+def to_array(typecode: str, values: Sequence[int]) -> array:
+    """Copies values into an array, as one memory copy if they're a typed buffer."""
+    if isinstance(values, (array, memoryview)):
+        column = array(typecode)
+        column.frombytes(memoryview(values).cast("B"))
+        return column
+    return array(typecode, values)
+
+
+class CartItem(Protocol):
+    """An item as carts use it: an Item, or an ItemRow view on an ItemTable."""
+
+    @property
+    def name(self) -> str:
+        ...
+
+    price: Money
+    quantity: int
+
+    @property
+    def subtotal(self) -> Money:
+        ...
+
+
+class ItemRow:
+    """Lightweight view on one item in an ItemTable, with the Item attributes.
+
+    A view belongs to a row, so don't keep it after removing items from the
+    table: compacting the table moves the rows.
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "ItemTable", row: int) -> None:
+        self._table = table
+        self._row = row
+
+    @property
+    def name(self) -> str:
+        return self._table.names[self._row]  # type: ignore
+
+    @property
+    def price(self) -> Money:
+        return Money(self._table.prices[self._row])
+
+    @price.setter
+    def price(self, price: Money) -> None:
+        self._table.prices[self._row] = ItemTable.to_cents(price)
+
+    @property
+    def quantity(self) -> int:
+        return self._table.quantities[self._row]
+
+    @quantity.setter
+    def quantity(self, quantity: int) -> None:
+        self._table.quantities[self._row] = quantity
+
+    @property
+    def subtotal(self) -> Money:
+        return Money(self._table.prices[self._row] * self._table.quantities[self._row])
+
+    def __eq__(self, other: object) -> bool:
+        try:
+            return (self.name, self.price, self.quantity) == (
+                other.name,  # type: ignore
+                other.price,  # type: ignore
+                other.quantity,  # type: ignore
+            )
+        except AttributeError:
+            return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return (
+            f"ItemRow(name={self.name!r}, price={self.price!r}, "
+            f"quantity={self.quantity!r})"
+        )
+
+
+class ItemTable:
+    """Items stored column-wise instead of as one object each.
+
+    Names are interned, so carts with the same products share the strings, prices
+    are stored as int64 cents and quantities as int32. It has the same interface
+    as ItemIndex, but lookups and iteration return ItemRow views. Removed rows are
+    left empty until half the table is, and then the table is compacted.
+    """
+
+    def __init__(self, items: Iterable[CartItem] = ()) -> None:
+        self.names: list[Optional[str]] = []
+        self.prices = array("q")
+        self.quantities = array("i")
+        self._rows: dict[str, int] = {}
+        for item in items:
+            self.append(item)
+
+    @classmethod
+    def from_columns(
+        cls, names: Sequence[str], prices: Sequence[int], quantities: Sequence[int]
+    ) -> "ItemTable":
+        """Builds a table from columns, like those of a decoded cart."""
+        table = cls()
+        table._rows = {sys.intern(name): row for row, name in enumerate(names)}
+        if len(table._rows) != len(names):
+            raise ValueError("Item names in a cart must be unique.")
+        table.names = list(table._rows)
+        table.prices = to_array("q", prices)
+        table.quantities = to_array("i", quantities)
+        return table
+
+    @staticmethod
+    def to_cents(price: Money) -> int:
+        if price.places != DEFAULT_PLACES:
+            raise ValueError("ItemTable only stores prices in cents.")
+        return price.minor_units
+
+    def append(self, item: CartItem) -> None:
+        if item.name in self._rows:
+            raise ValueError(f"Item '{item.name}' is already in the cart.")
+        self.prices.append(self.to_cents(item.price))
+        self.quantities.append(item.quantity)
+        self._rows[item.name] = len(self.names)
+        self.names.append(sys.intern(item.name))
+
+    def remove(self, item: CartItem) -> None:
+        row = self._rows.pop(item.name)
+        self.names[row] = None
+        self.prices[row] = self.quantities[row] = 0
+        if len(self._rows) < len(self.names) * COMPACT_RATIO:
+            self._compact()
+
+    def _compact(self) -> None:
+        live = [row for row, name in enumerate(self.names) if name is not None]
+        self.names = [self.names[row] for row in live]
+        self.prices = array("q", (self.prices[row] for row in live))
+        self.quantities = array("i", (self.quantities[row] for row in live))
+        self._rows = {name: row for row, name in enumerate(self.names)}  # type: ignore
+
+    def get(self, item_name: str) -> Optional[ItemRow]:
+        row = self._rows.get(item_name)
+        return None if row is None else ItemRow(self, row)
+
+    def __iter__(self) -> Iterator[ItemRow]:
+        for row, name in enumerate(self.names):
+            if name is not None:
+                yield ItemRow(self, row)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
@@ -0,0 +1,32 @@
+from decimal import Decimal
+
+import pytest
+
+from after import Item
+from discounts import Discount, DiscountPlan
+from money import Money
+
+PIZZA_5_OFF = Discount(amount=Decimal("5.00"), items=frozenset({"Pizza"}))
+APPLES = Item("Apple", Money(150), 10)
+
+
+def evaluate(discounts: list[Discount], items: list[Item]) -> Money:
+    subtotal = Money.sum(item.subtotal for item in items)
+    return DiscountPlan.compile(discounts).evaluate(items, subtotal)
+
+
+@pytest.mark.parametrize(
+    "items, expected",
+    [
+        ([APPLES], Money(0)),
+        ([APPLES, Item("Pizza", Money(300), 1)], Money(300)),
+        ([APPLES, Item("Pizza", Money(1190), 1)], Money(500)),
+    ],
+)
+def test_item_discount_is_capped_at_the_items_subtotal(items, expected):
+    assert evaluate([PIZZA_5_OFF], items) == expected
+
+
+def test_capped_item_discount_leaves_other_discounts_unchanged():
+    discounts = [PIZZA_5_OFF, Discount(percentage=Decimal("0.1"))]
+    assert evaluate(discounts, [APPLES]) == Money(150)
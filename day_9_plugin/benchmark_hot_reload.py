@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from timeit import default_timer as timer
+
+import plugin_manager
+
+PLUGIN_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+PLUGIN_TEMPLATE = '''from decimal import Decimal
+
+
+def get_payment_method() -> str:
+    return "{method}"
+
+
+def process_payment(total: Decimal) -> None:
+    print("{message}")
+'''
+
+
+def write_plugin(folder: str, name: str, method: str, message: str = "v1") -> None:
+    path = os.path.join(folder, f"{name}.py")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(PLUGIN_TEMPLATE.format(method=method, message=message))
+    # Make sure the change is visible even on file systems with coarse mtimes.
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+
+
+def main() -> None:
+    folder = tempfile.mkdtemp()
+    for index in range(PLUGIN_COUNT):
+        write_plugin(folder, f"plugin{index}", f"method{index}")
+    plugin_manager.load_plugins_concurrently(folder)
+    watcher = plugin_manager.PluginWatcher(folder)
+
+    start = timer()
+    watcher.poll()
+    print(f"Polling {PLUGIN_COUNT} unchanged plugins: {(timer() - start) * 1000:.2f}ms")
+
+    # Readers keep calling get_plugin while plugins are reloaded.
+    stop = threading.Event()
+    latencies: list[float] = []
+
+    def read() -> None:
+        while not stop.is_set():
+            start = timer()
+            plugin_manager.get_plugin("method0")
+            latencies.append(timer() - start)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+
+    write_plugin(folder, "plugin0", "method0", message="v2")
+    write_plugin(folder, "added", "new_method")
+    os.remove(os.path.join(folder, "plugin1.py"))
+    with open(os.path.join(folder, "plugin2.py"), "a", encoding="utf-8") as file:
+        file.write("def broken(:\n")
+    start = timer()
+    changes = watcher.poll()
+    elapsed = timer() - start
+    stop.set()
+    reader.join()
+
+    print(
+        f"Reloaded {len(changes.added)} added, {len(changes.changed)} changed and "
+        f"{len(changes.removed)} removed plugins in {elapsed * 1000:.2f}ms"
+    )
+    for module_path, error in changes.failed.items():
+        print(f"  kept the previous {os.path.basename(module_path)}: {error}")
+    # The slowest call is bounded by the GIL switch interval, not by a lock.
+    print(
+        f"{len(latencies):,} get_plugin calls meanwhile, "
+        f"slowest {max(latencies) * 1e6:.0f}us "
+        f"(switch interval {sys.getswitchinterval() * 1e6:.0f}us)"
+    )
+    assert plugin_manager.plugin_exists("new_method")
+    assert not plugin_manager.plugin_exists("method1")
+    assert plugin_manager.plugin_exists("method2")
+    plugin_manager.get_plugin("method0").process_payment(Decimal("0"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+from timeit import default_timer as timer
+
+import plugin_manager
+
+PLUGIN_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+IMPORT_LATENCY = 0.005  # seconds of I/O per plugin import, like reading config
+
+PLUGIN_TEMPLATE = '''import time
+from decimal import Decimal
+
+time.sleep({latency})
+
+
+def get_payment_method() -> str:
+    return "method{index}"
+
+
+def process_payment(total: Decimal) -> None:
+    print(f"Processing method{index} payment of ${{total:.2f}}...")
+'''
+
+
+def write_plugin(folder: str, name: str, source: str) -> None:
+    with open(os.path.join(folder, f"{name}.py"), "w", encoding="utf-8") as file:
+        file.write(source)
+
+
+def main() -> None:
+    folder = tempfile.mkdtemp()
+    for index in range(PLUGIN_COUNT):
+        write_plugin(
+            folder,
+            f"plugin{index}",
+            PLUGIN_TEMPLATE.format(index=index, latency=IMPORT_LATENCY),
+        )
+
+    start = timer()
+    plugin_manager.load_plugins_from_folder(folder)
+    print(f"Serial import of {PLUGIN_COUNT} plugins: {(timer() - start) * 1000:.1f}ms")
+    plugin_manager.PLUGINS.clear()
+    plugin_manager.PLUGIN_PATHS.clear()
+    report = plugin_manager.load_plugins_concurrently(folder)
+    print(f"Concurrent import: {report.elapsed * 1000:.1f}ms")
+    plugin_manager.PLUGINS.clear()
+    plugin_manager.PLUGIN_PATHS.clear()
+
+    # A broken plugin, a hanging one and a duplicate don't stop the others.
+    write_plugin(folder, "broken", "raise RuntimeError('missing credentials')\n")
+    write_plugin(folder, "hanging", PLUGIN_TEMPLATE.format(index="_hang", latency=10))
+    write_plugin(folder, "duplicate", PLUGIN_TEMPLATE.format(index=0, latency=0))
+    report = plugin_manager.load_plugins_concurrently(folder, timeout=1.0)
+    print(str(report).splitlines()[0])
+    for load in report.failed:
+        print(f"  {os.path.basename(load.module_path)}: {load.error}")
+    slowest = max(
+        (load for load in report.loads if not load.error), key=lambda load: load.seconds
+    )
+    print(
+        f"  slowest successful import: {os.path.basename(slowest.module_path)} "
+        f"{slowest.seconds * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
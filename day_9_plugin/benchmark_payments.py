@@ -0,0 +1,48 @@
+import asyncio
+import sys
+from decimal import Decimal
+from timeit import default_timer as timer
+
+import plugin_manager
+from gateway import LocalGateway
+from main_after import PLUGINS_FOLDER, handle_payments, handle_payments_async
+
+PAYMENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+ONE_BY_ONE = 500  # paying one at a time is too slow to run for all payments
+ROUND_TRIP = 0.002  # seconds per gateway call
+CREDENTIALS = {
+    "card_number": "4111111111111111",
+    "expiration_date": "12/30",
+    "ccv": "123",
+}
+
+
+def report(name: str, count: int, elapsed: float) -> None:
+    print(f"{name:<28}{count:>8,} payments {count / elapsed:>12,.0f}/s")
+
+
+def main() -> None:
+    plugin_manager.load_plugins_from_folder(PLUGINS_FOLDER, lazy=True)
+    payments = [(f"cart{i}", Decimal(i % 100 + 1) / 4) for i in range(PAYMENTS)]
+    print(f"Gateway round trip: {ROUND_TRIP * 1000:.0f}ms")
+
+    gateway = LocalGateway(latency=ROUND_TRIP)
+    start = timer()
+    for payment in payments[:ONE_BY_ONE]:
+        handle_payments("credit_card", CREDENTIALS, [payment], gateway)
+    report("one payment per call", ONE_BY_ONE, timer() - start)
+
+    start = timer()
+    results = handle_payments("credit_card", CREDENTIALS, payments, gateway)
+    report("batches of 500", len(results), timer() - start)
+
+    start = timer()
+    results = asyncio.run(
+        handle_payments_async("credit_card", CREDENTIALS, payments, gateway)
+    )
+    report("batches of 500, async", len(results), timer() - start)
+    assert all(result.approved for result in results)
+
+
+if __name__ == "__main__":
+    main()
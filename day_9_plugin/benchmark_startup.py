@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+PLUGIN_COUNTS = [4, 500]
+
+PLUGIN_TEMPLATE = '''from decimal import Decimal
+
+
+def get_payment_method() -> str:
+    return "method{index}"
+
+
+def process_payment(total: Decimal) -> None:
+    print(f"Processing method{index} payment of ${{total:.2f}}...")
+'''
+
+# Runs in a fresh interpreter, like a real startup.
+STARTUP = """
+from timeit import default_timer as timer
+import plugin_manager
+start = timer()
+plugin_manager.load_plugins_from_folder({folder!r}, lazy={lazy})
+loaded = timer()
+plugin_manager.get_plugin("method0")
+print(loaded - start, timer() - loaded)
+"""
+
+
+def startup(folder: str, lazy: bool) -> tuple[float, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP.format(folder=folder, lazy=lazy)],
+        capture_output=True,
+        check=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stdout
+    load_time, first_use = output.split()
+    return float(load_time), float(first_use)
+
+
+def main() -> None:
+    for count in PLUGIN_COUNTS:
+        folder = tempfile.mkdtemp()
+        for index in range(count):
+            path = os.path.join(folder, f"plugin{index}.py")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(PLUGIN_TEMPLATE.format(index=index))
+
+        startup(folder, lazy=False)  # compile the bytecode caches first
+        runs = {
+            "eager": startup(folder, lazy=False),
+            "lazy, first scan": startup(folder, lazy=True),
+            "lazy, manifest": startup(folder, lazy=True),
+        }
+        print(f"{count} plugins")
+        for name, (load_time, first_use) in runs.items():
+            print(
+                f"  {name:<18}startup {load_time * 1000:>8.2f}ms  "
+                f"first get_plugin {first_use * 1000:>6.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
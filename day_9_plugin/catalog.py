@@ -0,0 +1,196 @@
+import os
+import sqlite3
+from collections import OrderedDict
+from decimal import Decimal
+from timeit import default_timer as timer
+from typing import Iterable, Mapping, Optional, Protocol
+
+from discounts import Discount
+
+DEFAULT_CACHE_SIZE = 10_000
+DEFAULT_CHECK_INTERVAL = 1.0  # seconds between checks for catalog updates
+INSERT_BATCH_SIZE = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS discounts (
+    code TEXT PRIMARY KEY,
+    amount TEXT NOT NULL,
+    percentage TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    compound INTEGER NOT NULL,
+    cap TEXT,
+    items TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+
+class DiscountCatalog(Protocol):
+    """Looks up discount codes.
+
+    The version changes whenever the catalog was updated, so discounts that were
+    looked up before can be looked up again.
+    """
+
+    @property
+    def version(self) -> int:
+        ...
+
+    def get(self, code: str) -> Optional[Discount]:
+        ...
+
+    def __contains__(self, code: str) -> bool:
+        ...
+
+
+class InMemoryCatalog:
+    def __init__(self, discounts: Mapping[str, Discount]) -> None:
+        self.discounts = discounts
+
+    @property
+    def version(self) -> int:
+        return 0
+
+    def get(self, code: str) -> Optional[Discount]:
+        return self.discounts.get(code)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.discounts
+
+
+def to_row(code: str, discount: Discount) -> tuple:
+    return (
+        code,
+        str(discount.amount),
+        str(discount.percentage),
+        discount.priority,
+        int(discount.compound),
+        None if discount.cap is None else str(discount.cap),
+        ",".join(sorted(discount.items)),
+    )
+
+
+def from_row(row: tuple) -> Discount:
+    amount, percentage, priority, compound, cap, items = row
+    return Discount(
+        amount=Decimal(amount),
+        percentage=Decimal(percentage),
+        priority=priority,
+        compound=bool(compound),
+        cap=None if cap is None else Decimal(cap),
+        items=frozenset(items.split(",")) if items else frozenset(),
+    )
+
+
+def write_discounts(path: str, discounts: Iterable[tuple[str, Discount]]) -> int:
+    """Adds or replaces discounts in the catalog at path, in one transaction."""
+    connection = sqlite3.connect(path)
+    written = 0
+    try:
+        with connection:
+            connection.execute(SCHEMA)
+            rows: list[tuple] = []
+            for code, discount in discounts:
+                rows.append(to_row(code, discount))
+                if len(rows) == INSERT_BATCH_SIZE:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO discounts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    written += len(rows)
+                    rows = []
+            connection.executemany(
+                "INSERT OR REPLACE INTO discounts VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            written += len(rows)
+    finally:
+        connection.close()
+    return written
+
+
+class SQLiteCatalog:
+    """Discount catalog in an SQLite database, with an LRU cache in front.
+
+    Codes are looked up through the primary key index when they're needed, so
+    opening the catalog doesn't load any of them. Unknown codes are cached too.
+    At most once per check interval, the catalog checks whether the database was
+    changed (by another connection) or replaced, and then empties the cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+    ) -> None:
+        self.path = path
+        self.cache_size = cache_size
+        self.check_interval = check_interval
+        self.cache: OrderedDict[str, Optional[Discount]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._version = 0
+        self._connect()
+
+    def _connect(self) -> None:
+        self._connection = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._file_id = self._stat()
+        self._data_version = self._read_data_version()
+        self._checked_at = timer()
+
+    def _stat(self) -> tuple[int, int]:
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _read_data_version(self) -> int:
+        return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def reload_if_changed(self) -> bool:
+        self._checked_at = timer()
+        if self._stat() != self._file_id:
+            # Replaced (or written without WAL): start over with a new connection.
+            self._connection.close()
+            self._connect()
+        elif self._read_data_version() == self._data_version:
+            return False
+        else:
+            self._data_version = self._read_data_version()
+        self.cache.clear()
+        self._version += 1
+        return True
+
+    @property
+    def version(self) -> int:
+        if timer() - self._checked_at >= self.check_interval:
+            self.reload_if_changed()
+        return self._version
+
+    def get(self, code: str) -> Optional[Discount]:
+        if timer() - self._checked_at >= self.check_interval:
+            self.reload_if_changed()
+        if code in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(code)
+            return self.cache[code]
+
+        self.misses += 1
+        row = self._connection.execute(
+            "SELECT amount, percentage, priority, compound, cap, items "
+            "FROM discounts WHERE code = ?",
+            (code,),
+        ).fetchone()
+        discount = None if row is None else from_row(row)
+        self.cache[code] = discount
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return discount
+
+    def __contains__(self, code: str) -> bool:
+        return self.get(code) is not None
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM discounts").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
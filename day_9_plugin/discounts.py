@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional, Protocol
+
+from money import Money
+
+
+class PricedItem(Protocol):
+    @property
+    def name(self) -> str:
+        ...
+
+    @property
+    def price(self) -> Money:
+        ...
+
+    @property
+    def quantity(self) -> int:
+        ...
+
+
+@dataclass(frozen=True)
+class Discount:
+    """A discount rule: a fixed amount and/or a percentage off.
+
+    Rules apply in order of priority (lowest first, ties in the order they were
+    applied). A compound rule takes its percentage off what's left after the rules
+    before it instead of off the subtotal. A cap limits how much a rule can take
+    off, and a rule with items only applies to the subtotal of those items.
+    """
+
+    amount: Decimal = Decimal("0")
+    percentage: Decimal = Decimal("0")
+    priority: int = 0
+    compound: bool = False
+    cap: Optional[Decimal] = None
+    items: frozenset[str] = frozenset()
+
+    def __post_init__(self) -> None:
+        if self.compound and self.items:
+            raise ValueError("An item-scoped discount can't be compound.")
+
+    @property
+    def is_plain(self) -> bool:
+        return not (self.compound or self.cap is not None or self.items)
+
+
+@dataclass(frozen=True, slots=True)
+class DiscountStep:
+    amount: int
+    percentage: Decimal
+    compound: bool = False
+    cap: Optional[int] = None
+    scope: Optional[int] = None  # index into the scoped subtotals, None = whole cart
+
+
+@dataclass(frozen=True)
+class DiscountPlan:
+    """Applied discounts compiled into steps that are evaluated in one pass.
+
+    Consecutive plain rules are folded into a single step, since their amounts and
+    percentages of the subtotal simply add up.
+    """
+
+    steps: tuple[DiscountStep, ...] = ()
+    scopes: dict[str, tuple[int, ...]] | None = None  # item name -> scope indexes
+    scope_count: int = 0
+
+    @classmethod
+    def compile(cls, discounts: Iterable[Discount], places: int = 2) -> "DiscountPlan":
+        ordered = sorted(discounts, key=lambda discount: discount.priority)
+        steps: list[DiscountStep] = []
+        scopes: dict[str, list[int]] = {}
+        scope_count = 0
+        for discount in ordered:
+            amount = Money.from_decimal(discount.amount, places).minor_units
+            if discount.is_plain and steps and steps[-1].scope is None:
+                last = steps[-1]
+                if not last.compound and last.cap is None:
+                    steps[-1] = DiscountStep(
+                        last.amount + amount, last.percentage + discount.percentage
+                    )
+                    continue
+            scope = None
+            if discount.items:
+                scope, scope_count = scope_count, scope_count + 1
+                for name in discount.items:
+                    scopes.setdefault(name, []).append(scope)
+            cap = (
+                None
+                if discount.cap is None
+                else Money.from_decimal(discount.cap, places).minor_units
+            )
+            steps.append(
+                DiscountStep(amount, discount.percentage, discount.compound, cap, scope)
+            )
+        return cls(
+            tuple(steps),
+            {name: tuple(indexes) for name, indexes in scopes.items()} or None,
+            scope_count,
+        )
+
+    def evaluate(self, items: Iterable[PricedItem], subtotal: Money) -> Money:
+        """Returns the total discount.
+
+        The items are only iterated over if some rules are item-scoped, otherwise
+        the subtotal is all that's needed.
+        """
+        scoped = [0] * self.scope_count
+        if self.scopes:
+            for item in items:
+                indexes = self.scopes.get(item.name)
+                if indexes:
+                    line = item.price.minor_units * item.quantity
+                    for index in indexes:
+                        scoped[index] += line
+
+        total = 0
+        for step in self.steps:
+            if step.scope is not None:
+                base = scoped[step.scope]
+            elif step.compound:
+                # What's left after the earlier rules, which can be nothing.
+                base = max(subtotal.minor_units - total, 0)
+            else:
+                base = subtotal.minor_units
+            discount = step.amount
+            if step.percentage:
+                discount += (
+                    Money(base, subtotal.places).percentage(step.percentage).minor_units
+                )
+            if step.cap is not None:
+                discount = min(discount, step.cap)
+            if step.scope is not None:
+                # An item discount can't take off more than those items cost.
+                discount = min(discount, base)
+            total += discount
+        return Money(total, subtotal.places)
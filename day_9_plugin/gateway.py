@@ -0,0 +1,96 @@
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterator, Mapping, Protocol, Sequence
+
+CHECKOUT_CART_ID = "checkout"  # cart id of interactive, one-off payments
+DEFAULT_BATCH_SIZE = 500
+
+Payment = tuple[str, Decimal]  # cart id, total
+Credentials = Mapping[str, str]
+
+
+class PaymentError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class PaymentResult:
+    cart_id: str
+    amount: Decimal
+    approved: bool
+    reference: str = ""
+    error: str = ""
+
+
+class Gateway(Protocol):
+    def charge_batch(
+        self, method: str, credentials: Credentials, payments: Sequence[Payment]
+    ) -> list[PaymentResult]:
+        ...
+
+    async def charge_batch_async(
+        self, method: str, credentials: Credentials, payments: Sequence[Payment]
+    ) -> list[PaymentResult]:
+        ...
+
+
+def check_credentials(credentials: Credentials, required: Sequence[str]) -> None:
+    missing = [name for name in required if not credentials.get(name)]
+    if missing:
+        raise PaymentError(f"Missing credentials: {', '.join(missing)}.")
+
+
+def check_results(results: Sequence[PaymentResult]) -> None:
+    """Raises PaymentError if any of the payments was declined."""
+    for result in results:
+        if not result.approved:
+            raise PaymentError(
+                f"Payment of cart {result.cart_id} declined: {result.error}"
+            )
+
+
+def batches(payments: Sequence[Payment], size: int) -> Iterator[Sequence[Payment]]:
+    for start in range(0, len(payments), size):
+        yield payments[start : start + size]
+
+
+class LocalGateway:
+    """Stand-in for a payment provider's batch API.
+
+    Every batch takes one round trip of the given latency. Positive amounts are
+    approved, anything else is declined.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.round_trips = 0
+        self._references = itertools.count(1)
+
+    def _charge(self, method: str, payments: Sequence[Payment]) -> list[PaymentResult]:
+        self.round_trips += 1
+        return [
+            PaymentResult(cart_id, amount, True, f"{method}-{next(self._references)}")
+            if amount > 0
+            else PaymentResult(cart_id, amount, False, error="Invalid amount.")
+            for cart_id, amount in payments
+        ]
+
+    def charge_batch(
+        self, method: str, credentials: Credentials, payments: Sequence[Payment]
+    ) -> list[PaymentResult]:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._charge(method, payments)
+
+    async def charge_batch_async(
+        self, method: str, credentials: Credentials, payments: Sequence[Payment]
+    ) -> list[PaymentResult]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._charge(method, payments)
+
+
+LOCAL_GATEWAY = LocalGateway()
@@ -1,26 +1,83 @@
+import asyncio
 from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import Iterable, Iterator, Optional, TextIO
+
+from cart_codec import (
+    CartLine,
+    CartRecord,
+    encode_cart,
+    encode_delta,
+    encode_json,
+    load_cart,
+)
+from catalog import DiscountCatalog, InMemoryCatalog
+from discounts import Discount, DiscountPlan
+from gateway import (
+    DEFAULT_BATCH_SIZE,
+    LOCAL_GATEWAY,
+    Credentials,
+    Gateway,
+    Payment,
+    PaymentError,
+    PaymentResult,
+    batches,
+)
+from item_table import CartItem, ItemTable
+from money import Money, to_money
+from receipt import print_receipt, render_receipt
 
 import plugin_manager
 
 PLUGINS_FOLDER = "plugins"
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     name: str
-    price: Decimal
+    price: Money
     quantity: int
 
+    def __post_init__(self) -> None:
+        self.price = to_money(self.price)
+
     @property
-    def subtotal(self) -> Decimal:
+    def subtotal(self) -> Money:
         return self.price * self.quantity
 
 
-@dataclass
-class Discount:
-    amount: Decimal
-    percentage: Decimal
+class ItemIndex:
+    """Items in insertion order, indexed by name for O(1) lookups and removals."""
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self._items: dict[str, Item] = {}
+        for item in items:
+            self.append(item)
+
+    def append(self, item: Item) -> None:
+        if item.name in self._items:
+            raise ValueError(f"Item '{item.name}' is already in the cart.")
+        self._items[item.name] = item
+
+    def remove(self, item: CartItem) -> None:
+        del self._items[item.name]
+
+    def get(self, item_name: str) -> Item | None:
+        return self._items.get(item_name)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
 
 
 DISCOUNTS = {
@@ -28,68 +85,156 @@ DISCOUNTS = {
     "5BUCKSOFF": Discount(amount=Decimal("5.00"), percentage=Decimal("0")),
     "FREESHIPPING": Discount(amount=Decimal("2.00"), percentage=Decimal("0")),
     "BLKFRIDAY": Discount(amount=Decimal("0"), percentage=Decimal("0.2")),
+    "PIZZAPARTY": Discount(
+        percentage=Decimal("0.25"), cap=Decimal("10.00"), items=frozenset({"Pizza"})
+    ),
+    "LOYALTY5": Discount(percentage=Decimal("0.05"), priority=10, compound=True),
 }
+DEFAULT_CATALOG = InMemoryCatalog(DISCOUNTS)
 
 
 @dataclass
 class ShoppingCart:
-    items: list[Item] = field(default_factory=list)
+    """Shopping cart that caches its discount until the cart changes.
+
+    The applied discount codes are compiled into a DiscountPlan when they or the
+    catalog change.
+    Change the cart through its methods, or call invalidate() after changing
+    items directly.
+    """
+
+    items: Iterable[Item] | ItemIndex | ItemTable = field(default_factory=ItemIndex)
     discounts: list[str] = field(default_factory=list)
+    catalog: DiscountCatalog = field(
+        default=DEFAULT_CATALOG, repr=False, compare=False
+    )
+    # The items as an ItemIndex or ItemTable, set from items by __post_init__.
+    _items: ItemIndex | ItemTable = field(init=False, repr=False, compare=False)
+    _plan: DiscountPlan = field(
+        default=DiscountPlan(), init=False, repr=False, compare=False
+    )
+    _catalog_version: int = field(default=0, init=False, repr=False, compare=False)
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _cached_discount: tuple[int, Money] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        items = self.items
+        if not isinstance(items, (ItemIndex, ItemTable)):
+            items = ItemIndex(items)
+        self.items = self._items = items
+        self._compile_plan()
 
     def add_item(self, item: Item) -> None:
-        self.items.append(item)
+        self._items.append(item)
+        self._version += 1
 
     def remove_item(self, item_name: str) -> None:
         found_item = self.find_item(item_name)
         if not found_item:
             print(f"Item '{item_name}' not in shopping cart, can't remove it!")
         else:
-            self.items.remove(found_item)
+            self._items.remove(found_item)
+            self._version += 1
+
+    def invalidate(self) -> None:
+        self._version += 1
 
-    def find_item(self, item_name: str) -> Item | None:
-        for item in self.items:
-            if item.name == item_name:
-                return item
-        return None
+    def find_item(self, item_name: str) -> CartItem | None:
+        return self._items.get(item_name)
 
     @property
-    def subtotal(self) -> Decimal:
-        return Decimal(sum(item.subtotal for item in self.items))
+    def subtotal(self) -> Money:
+        return Money(
+            sum(item.price.minor_units * item.quantity for item in self._items)
+        )
 
     @property
-    def total(self) -> Decimal:
+    def total(self) -> Money:
         return self.subtotal - self.discount
 
     def apply_discount(self, code: str) -> None:
-        if not code in DISCOUNTS:
+        if not code in self.catalog:
             print(f"Discount code '{code}' is not valid!")
             return
         self.discounts.append(code)
+        self._compile_plan()
 
     def remove_discount(self, code: str) -> None:
         self.discounts.remove(code)
+        self._compile_plan()
+
+    def _compile_plan(self) -> None:
+        self._catalog_version = self.catalog.version
+        discounts = (self.catalog.get(code) for code in self.discounts)
+        self._plan = DiscountPlan.compile(
+            discount for discount in discounts if discount is not None
+        )
+        self._version += 1
 
     @property
-    def discount(self) -> Decimal:
-        total_discount = Decimal("0")
-        for code in self.discounts:
-            if code in DISCOUNTS:
-                total_discount += DISCOUNTS[code].amount + (
-                    DISCOUNTS[code].percentage * self.subtotal
-                )
-        return total_discount
+    def discount(self) -> Money:
+        if self.catalog.version != self._catalog_version:
+            self._compile_plan()
+        if self._cached_discount and self._cached_discount[0] == self._version:
+            return self._cached_discount[1]
+        discount = self._plan.evaluate(self._items, self.subtotal)
+        self._cached_discount = (self._version, discount)
+        return discount
+
+    def summary(self) -> list[tuple[str, Money]]:
+        subtotal = self.subtotal
+        discount = self.discount
+        return [
+            ("Subtotal", subtotal),
+            ("Discount", discount),
+            ("Total", subtotal - discount),
+        ]
+
+    def render(
+        self, format: str = "text", out: Optional[TextIO] = None
+    ) -> Optional[str]:
+        return render_receipt(self._items, self.summary(), format, out)
 
     def print_cart(self) -> None:
-        print("Shopping Cart:")
-        print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
-        for item in self.items:
-            print(
-                f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"
+        print_receipt(self._items, self.summary())
+
+    def lines(self) -> Iterator[CartLine]:
+        return (
+            (item.name, ItemTable.to_cents(item.price), item.quantity)
+            for item in self._items
+        )
+
+    def to_bytes(self, format: str = "binary") -> bytes:
+        if format == "json":
+            return encode_json(self.lines(), self.discounts)
+        return encode_cart(self.lines(), self.discounts)
+
+    def delta_since(self, base: CartRecord) -> bytes:
+        """Encodes only what changed since the cart was saved as base."""
+        return encode_delta(base, self.lines(), self.discounts)
+
+    @classmethod
+    def from_record(
+        cls, record: CartRecord, compact: bool = False, **kwargs
+    ) -> "ShoppingCart":
+        """Builds a cart from a decoded one, with an ItemTable if compact."""
+        items: ItemIndex | ItemTable
+        if compact:
+            items = ItemTable.from_columns(
+                record.names, record.prices, record.quantities
             )
-        print("=" * 40)
-        print(f"Subtotal: ${self.subtotal:>7.2f}")
-        print(f"Discount: ${self.discount:>7.2f}")
-        print(f"Total:    ${self.total:>7.2f}")
+        else:
+            items = ItemIndex(
+                Item(name, Money(price), quantity)
+                for name, price, quantity in record.lines()
+            )
+        return cls(items=items, discounts=list(record.codes), **kwargs)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, compact: bool = False, **kwargs) -> "ShoppingCart":
+        return cls.from_record(load_cart(data), compact, **kwargs)
 
 
 def handle_payment(total: Decimal) -> None:
@@ -104,17 +249,52 @@ def handle_payment(total: Decimal) -> None:
         payment_handler.process_payment(total)
     except KeyError:
         print(f"Payment type '{payment_type}' is not valid!")
+    except PaymentError as error:
+        print(f"Payment failed: {error}")
+
+
+def handle_payments(
+    payment_type: str,
+    credentials: Credentials,
+    payments: list[Payment],
+    gateway: Gateway = LOCAL_GATEWAY,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> list[PaymentResult]:
+    """Pays many carts without asking for anything, one gateway call per batch."""
+    plugin = plugin_manager.get_batch_plugin(payment_type)
+    results: list[PaymentResult] = []
+    for batch in batches(payments, batch_size):
+        results.extend(plugin.process_payments(credentials, list(batch), gateway))
+    return results
+
+
+async def handle_payments_async(
+    payment_type: str,
+    credentials: Credentials,
+    payments: list[Payment],
+    gateway: Gateway = LOCAL_GATEWAY,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> list[PaymentResult]:
+    """Like handle_payments, but with all batches in flight at the same time."""
+    plugin = plugin_manager.get_batch_plugin(payment_type)
+    results = await asyncio.gather(
+        *(
+            plugin.process_payments_async(credentials, list(batch), gateway)
+            for batch in batches(payments, batch_size)
+        )
+    )
+    return [result for batch_results in results for result in batch_results]
 
 
 def main() -> None:
-    plugin_manager.load_plugins_from_folder(PLUGINS_FOLDER)
+    plugin_manager.load_plugins_from_folder(PLUGINS_FOLDER, lazy=True)
 
     # Create a shopping cart and add some items to it
     cart = ShoppingCart(
         items=[
-            Item("Apple", Decimal("1.50"), 10),
-            Item("Banana", Decimal("2.00"), 2),
-            Item("Pizza", Decimal("11.90"), 5),
+            Item("Apple", to_money(Decimal("1.50")), 10),
+            Item("Banana", to_money(Decimal("2.00")), 2),
+            Item("Pizza", to_money(Decimal("11.90")), 5),
         ],
     )
     cart.apply_discount("SAVE10")
@@ -122,7 +302,7 @@ def main() -> None:
     # Print the total
     cart.print_cart()
 
-    handle_payment(cart.total)
+    handle_payment(cart.total.to_decimal())
 
 
 if __name__ == "__main__":
@@ -1,9 +1,25 @@
+from dataclasses import dataclass, field
 from decimal import Decimal
+import ast
+import hashlib
 import importlib
 from importlib.util import module_from_spec, spec_from_file_location
-from typing import Protocol
+import json
+import queue
+import threading
+from timeit import default_timer as timer
+from typing import Callable, Optional, Protocol
 import os
 
+from gateway import Credentials, Gateway, Payment, PaymentResult
+
+MANIFEST_FILE = ".plugin_manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_WORKERS = 16
+DEFAULT_IMPORT_TIMEOUT = 5.0  # seconds
+POLL_INTERVAL = 0.01  # seconds between checks for plugins that time out
+DEFAULT_WATCH_INTERVAL = 1.0  # seconds between scans of a watched folder
+
 
 class Plugin(Protocol):
     @staticmethod
@@ -15,33 +31,435 @@ class Plugin(Protocol):
         ...
 
 
+class BatchPlugin(Plugin, Protocol):
+    """A plugin that can pay many carts at once with pre-collected credentials.
+
+    process_payment remains the interactive way to pay a single total.
+    """
+
+    REQUIRED_CREDENTIALS: tuple[str, ...]
+
+    @staticmethod
+    def process_payments(
+        credentials: Credentials, payments: list[Payment], gateway: Gateway
+    ) -> list[PaymentResult]:
+        ...
+
+    @staticmethod
+    async def process_payments_async(
+        credentials: Credentials, payments: list[Payment], gateway: Gateway
+    ) -> list[PaymentResult]:
+        ...
+
+
 PLUGINS: dict[str, Plugin] = {}
+PLUGIN_PATHS: dict[str, str] = {}  # payment method -> module path, loaded or not
+_REGISTRY_LOCK = threading.Lock()  # serializes swapping in reloaded plugins
 
 
 def import_module(name: str) -> Plugin:
     return importlib.import_module(name)  # type: ignore
 
 
-def load_plugins_from_folder(folder: str) -> None:
-    for root, _, files in os.walk(folder):
-        for file in files:
-            if file.endswith(".py"):
-                module_name = file[:-3]
-                module_path = os.path.join(root, file)
-                spec = spec_from_file_location(module_name, module_path)
-                if spec:
-                    module: Plugin = module_from_spec(spec)  # type: ignore
-                    spec.loader.exec_module(module)  # type: ignore
-                    PLUGINS[module.get_payment_method()] = module
+def load_plugin(module_path: str) -> Plugin:
+    module_name = os.path.splitext(os.path.basename(module_path))[0]
+    spec = spec_from_file_location(module_name, module_path)
+    if not spec:
+        raise ImportError(f"Can't load plugin {module_path}.")
+    module: Plugin = module_from_spec(spec)  # type: ignore
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
+def plugin_files(folder: str) -> list[str]:
+    """The plugin paths in the folder, sorted, which is the order they're loaded in."""
+    return sorted(
+        os.path.join(root, file)
+        for root, _, files in os.walk(folder)
+        for file in files
+        if file.endswith(".py")
+    )
+
+
+def read_payment_method(source: bytes) -> Optional[str]:
+    """Returns the payment method, if get_payment_method just returns a string."""
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.FunctionDef) and node.name == "get_payment_method":
+            body = [
+                statement
+                for statement in node.body
+                if not (
+                    isinstance(statement, ast.Expr)
+                    and isinstance(statement.value, ast.Constant)
+                )
+            ]
+            if (
+                len(body) == 1
+                and isinstance(body[0], ast.Return)
+                and isinstance(body[0].value, ast.Constant)
+                and isinstance(body[0].value.value, str)
+            ):
+                return body[0].value.value
+    return None
+
+
+def read_manifest(path: str) -> dict[str, dict]:
+    try:
+        with open(path, encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest["plugins"]
+
+
+def write_manifest(path: str, entries: dict[str, dict]) -> None:
+    # Write a temporary file and rename it, so readers never see half a manifest.
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump({"version": MANIFEST_VERSION, "plugins": entries}, file, indent=2)
+    os.replace(temporary_path, path)
+
+
+def scan_plugins(folder: str, manifest_path: Optional[str] = None) -> dict[str, str]:
+    """Returns the payment method of every plugin in the folder, by module path.
+
+    The payment methods are kept in a manifest with the size, modification time
+    and hash of each file, so only new or changed files are read again. Those
+    are parsed rather than imported, unless their payment method isn't a string
+    literal.
+    """
+    manifest_path = manifest_path or os.path.join(folder, MANIFEST_FILE)
+    manifest = read_manifest(manifest_path)
+    entries: dict[str, dict] = {}
+    changed = False
+    for module_path in plugin_files(folder):
+        stat = os.stat(module_path)
+        key = os.path.relpath(module_path, folder)
+        entry = manifest.get(key)
+        if entry and (entry["mtime_ns"], entry["size"]) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            entries[key] = entry
+            continue
+
+        changed = True
+        with open(module_path, "rb") as file:
+            source = file.read()
+        digest = hashlib.sha256(source).hexdigest()
+        if entry and entry["sha256"] == digest:
+            method = entry["method"]  # touched, but not changed
+        else:
+            method = read_payment_method(source)
+            if method is None:
+                plugin = load_plugin(module_path)
+                method = plugin.get_payment_method()
+                PLUGINS[method] = plugin
+        entries[key] = {
+            "method": method,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+        }
+
+    if changed or entries.keys() != manifest.keys():
+        write_manifest(manifest_path, entries)
+    return {
+        os.path.join(folder, key): entry["method"] for key, entry in entries.items()
+    }
+
+
+def load_plugins_from_folder(folder: str, lazy: bool = False) -> None:
+    """Registers the plugins in the folder.
+
+    If lazy, plugins are found through the manifest and only imported when
+    they're first used.
+    """
+    if lazy:
+        for module_path, method in scan_plugins(folder).items():
+            PLUGIN_PATHS[method] = module_path
+        return
+    for module_path in plugin_files(folder):
+        module = load_plugin(module_path)
+        PLUGINS[module.get_payment_method()] = module
+        PLUGIN_PATHS[module.get_payment_method()] = module_path
 
 
 def get_plugin(name: str) -> Plugin:
-    return PLUGINS[name]
+    plugins = PLUGINS  # the watcher may swap in a new registry meanwhile
+    plugin = plugins.get(name)
+    if plugin is None:
+        plugin = plugins[name] = load_plugin(PLUGIN_PATHS[name])
+    return plugin
+
+
+def get_batch_plugin(name: str) -> BatchPlugin:
+    plugin = get_plugin(name)
+    if not hasattr(plugin, "process_payments"):
+        raise TypeError(f"Plugin {name!r} can't process payments in batches.")
+    return plugin  # type: ignore
 
 
 def plugin_exists(name: str) -> bool:
-    return name in PLUGINS
+    return name in PLUGINS or name in PLUGIN_PATHS
 
 
 def all_plugins() -> list[str]:
-    return list(PLUGINS.keys())
+    return list(dict.fromkeys([*PLUGINS, *PLUGIN_PATHS]))
+
+
+@dataclass
+class PluginLoad:
+    module_path: str
+    method: Optional[str] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class LoadReport:
+    loads: list[PluginLoad] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def failed(self) -> list[PluginLoad]:
+        return [load for load in self.loads if load.error]
+
+    def __str__(self) -> str:
+        lines = [
+            f"Loaded {len(self.loads) - len(self.failed)} of {len(self.loads)} "
+            f"plugins in {self.elapsed * 1000:.1f}ms"
+        ]
+        for load in sorted(self.loads, key=lambda load: -load.seconds):
+            status = f"FAILED: {load.error}" if load.error else load.method
+            lines.append(
+                f"  {os.path.basename(load.module_path):<24}"
+                f"{load.seconds * 1000:>9.1f}ms  {status}"
+            )
+        return "\n".join(lines)
+
+
+LoadResult = tuple[str, Optional[Plugin], float, Optional[Exception]]
+
+
+def _load_worker(
+    paths: "queue.Queue[str]",
+    results: "queue.Queue[LoadResult]",
+    started: dict[str, float],
+) -> None:
+    while True:
+        try:
+            module_path = paths.get_nowait()
+        except queue.Empty:
+            return
+        started[module_path] = timer()
+        try:
+            module = load_plugin(module_path)
+            module.get_payment_method()
+        except Exception as error:  # pylint: disable=broad-except
+            results.put((module_path, None, timer() - started[module_path], error))
+        else:
+            results.put((module_path, module, timer() - started[module_path], None))
+
+
+def _register_in_order(
+    module_paths: list[str], loads: dict[str, PluginLoad], modules: dict[str, Plugin]
+) -> None:
+    registered: dict[str, PluginLoad] = {}
+    for module_path in module_paths:
+        module = modules.get(module_path)
+        if module is None:
+            continue
+        method = module.get_payment_method()
+        if method in registered:
+            registered[method].error = (
+                f"duplicate payment method {method!r}, "
+                f"replaced by {os.path.basename(module_path)}"
+            )
+        registered[method] = loads[module_path]
+        PLUGINS[method] = module
+        PLUGIN_PATHS[method] = module_path
+
+
+def load_plugins_concurrently(  # pylint: disable=too-many-locals
+    folder: str,
+    workers: int = DEFAULT_WORKERS,
+    timeout: float = DEFAULT_IMPORT_TIMEOUT,
+) -> LoadReport:
+    """Imports the plugins in the folder on worker threads and registers them.
+
+    A plugin that raises an exception or takes longer than the timeout to import
+    is left out and reported, without affecting the other plugins. Threads can't
+    be stopped, so an import that timed out is abandoned on its daemon thread,
+    which doesn't keep the process from exiting, and a new worker takes its place.
+
+    The imported plugins are registered in path order once all imports are done,
+    like load_plugins_from_folder() does, so when two plugins claim the same
+    payment method the later path wins, however long the imports took, and the
+    earlier one is reported as a duplicate.
+    """
+    start = timer()
+    module_paths = plugin_files(folder)
+    loads: dict[str, PluginLoad] = {}
+    modules: dict[str, Plugin] = {}
+    started: dict[str, float] = {}
+    paths: queue.Queue[str] = queue.Queue()
+    results: queue.Queue[LoadResult] = queue.Queue()
+    pending = set(module_paths)
+    for module_path in module_paths:
+        paths.put(module_path)
+
+    def add_worker() -> None:
+        threading.Thread(
+            target=_load_worker, args=(paths, results, started), daemon=True
+        ).start()
+
+    for _ in range(min(workers, len(pending))):
+        add_worker()
+
+    while pending:
+        try:
+            module_path, module, seconds, error = results.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            pass
+        else:
+            if module_path in pending:  # else it timed out, and is ignored
+                pending.remove(module_path)
+                if module is None:
+                    loads[module_path] = PluginLoad(
+                        module_path, seconds=seconds, error=repr(error)
+                    )
+                else:
+                    method = module.get_payment_method()
+                    loads[module_path] = PluginLoad(module_path, method, seconds)
+                    modules[module_path] = module
+
+        now = timer()
+        for module_path in list(pending):
+            if module_path in started and now - started[module_path] > timeout:
+                pending.remove(module_path)
+                loads[module_path] = PluginLoad(
+                    module_path,
+                    seconds=now - started[module_path],
+                    error=f"timed out after {timeout}s",
+                )
+                add_worker()  # the stuck worker won't pick up any other plugin
+    _register_in_order(module_paths, loads, modules)
+    return LoadReport(
+        [loads[module_path] for module_path in module_paths], timer() - start
+    )
+
+
+@dataclass
+class PluginChanges:
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)  # module path -> error
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed or self.failed)
+
+
+def file_states(folder: str) -> dict[str, tuple[int, int]]:
+    states = {}
+    for module_path in plugin_files(folder):
+        try:
+            stat = os.stat(module_path)
+        except FileNotFoundError:  # removed while scanning
+            continue
+        states[module_path] = (stat.st_mtime_ns, stat.st_size)
+    return states
+
+
+class PluginWatcher:
+    """Polls a plugin folder and reloads the plugins that were added or changed.
+
+    Only the affected modules are imported, outside of the registry. They're
+    swapped in by replacing PLUGINS and PLUGIN_PATHS with updated copies, so
+    get_plugin callers never wait and never see a half-updated registry. A
+    plugin that fails to load keeps its previous version, if it had one.
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        on_change: Optional[Callable[[PluginChanges], None]] = None,
+    ) -> None:
+        self.folder = folder
+        self.interval = interval
+        self.on_change = on_change
+        self.files = file_states(folder)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self) -> PluginChanges:
+        files = file_states(self.folder)
+        changes = PluginChanges(
+            added=[path for path in files if path not in self.files],
+            changed=[
+                path
+                for path, state in files.items()
+                if path in self.files and self.files[path] != state
+            ],
+            removed=[path for path in self.files if path not in files],
+        )
+        self.files = files
+        if changes:
+            self._swap(changes)
+            if self.on_change:
+                self.on_change(changes)
+        return changes
+
+    def _swap(self, changes: PluginChanges) -> None:
+        global PLUGINS, PLUGIN_PATHS  # pylint: disable=global-statement
+        loaded: dict[str, Plugin] = {}
+        for module_path in changes.added + changes.changed:
+            try:
+                loaded[module_path] = load_plugin(module_path)
+                loaded[module_path].get_payment_method()
+            except Exception as error:  # pylint: disable=broad-except
+                loaded.pop(module_path, None)
+                changes.failed[module_path] = repr(error)
+
+        with _REGISTRY_LOCK:
+            plugins, paths = dict(PLUGINS), dict(PLUGIN_PATHS)
+            replaced = set(changes.removed) | set(loaded)
+            for method, module_path in PLUGIN_PATHS.items():
+                if module_path in replaced:
+                    del paths[method]
+                    plugins.pop(method, None)
+            for module_path, module in loaded.items():
+                method = module.get_payment_method()
+                if method in paths:
+                    changes.failed[module_path] = f"duplicate payment method {method!r}"
+                    continue
+                plugins[method] = module
+                paths[method] = module_path
+            PLUGIN_PATHS = paths
+            PLUGINS = plugins
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "PluginWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
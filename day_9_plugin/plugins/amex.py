@@ -1,11 +1,44 @@
 from decimal import Decimal
 
+from gateway import (
+    CHECKOUT_CART_ID,
+    LOCAL_GATEWAY,
+    Credentials,
+    Gateway,
+    Payment,
+    PaymentResult,
+    check_credentials,
+    check_results,
+)
+
+REQUIRED_CREDENTIALS = ("card_id",)
+
 
 def get_payment_method() -> str:
     return "amex"
 
 
+def process_payments(
+    credentials: Credentials,
+    payments: list[Payment],
+    gateway: Gateway = LOCAL_GATEWAY,
+) -> list[PaymentResult]:
+    check_credentials(credentials, REQUIRED_CREDENTIALS)
+    return gateway.charge_batch(get_payment_method(), credentials, payments)
+
+
+async def process_payments_async(
+    credentials: Credentials,
+    payments: list[Payment],
+    gateway: Gateway = LOCAL_GATEWAY,
+) -> list[PaymentResult]:
+    check_credentials(credentials, REQUIRED_CREDENTIALS)
+    return await gateway.charge_batch_async(get_payment_method(), credentials, payments)
+
+
 def process_payment(total: Decimal) -> None:
+    """Interactive checkout: asks for the credentials and pays a single total."""
     card_id = input("Please enter your amex card ID: ")
-    card_id = card_id[-4:].rjust(len(card_id), "*")
-    print(f"Processing Amex payment of ${total:.2f} with card ID {card_id}...")
+    card_id_masked = card_id[-4:].rjust(len(card_id), "*")
+    print(f"Processing Amex payment of ${total:.2f} with card ID {card_id_masked}...")
+    check_results(process_payments({"card_id": card_id}, [(CHECKOUT_CART_ID, total)]))
@@ -1,13 +1,48 @@
 from decimal import Decimal
 
+from gateway import (
+    CHECKOUT_CART_ID,
+    LOCAL_GATEWAY,
+    Credentials,
+    Gateway,
+    Payment,
+    PaymentResult,
+    check_credentials,
+    check_results,
+)
+
+REQUIRED_CREDENTIALS = ("device_id",)
+
 
 def get_payment_method() -> str:
     return "apple_pay"
 
 
+def process_payments(
+    credentials: Credentials,
+    payments: list[Payment],
+    gateway: Gateway = LOCAL_GATEWAY,
+) -> list[PaymentResult]:
+    check_credentials(credentials, REQUIRED_CREDENTIALS)
+    return gateway.charge_batch(get_payment_method(), credentials, payments)
+
+
+async def process_payments_async(
+    credentials: Credentials,
+    payments: list[Payment],
+    gateway: Gateway = LOCAL_GATEWAY,
+) -> list[PaymentResult]:
+    check_credentials(credentials, REQUIRED_CREDENTIALS)
+    return await gateway.charge_batch_async(get_payment_method(), credentials, payments)
+
+
 def process_payment(total: Decimal) -> None:
+    """Interactive checkout: asks for the credentials and pays a single total."""
     device_id = input("Please enter your Apple Pay device ID: ")
     device_id_masked = device_id[-4:].rjust(len(device_id), "*")
     print(
         f"Processing Apple Pay payment of ${total:.2f} with device ID {device_id_masked}..."
     )
+    check_results(
+        process_payments({"device_id": device_id}, [(CHECKOUT_CART_ID, total)])
+    )
@@ -1,11 +1,43 @@
 from decimal import Decimal
 
+from gateway import (
+    CHECKOUT_CART_ID,
+    LOCAL_GATEWAY,
+    Credentials,
+    Gateway,
+    Payment,
+    PaymentResult,
+    check_credentials,
+    check_results,
+)
+
+REQUIRED_CREDENTIALS = ("card_number", "expiration_date", "ccv")
+
 
 def get_payment_method() -> str:
     return "credit_card"
 
 
+def process_payments(
+    credentials: Credentials,
+    payments: list[Payment],
+    gateway: Gateway = LOCAL_GATEWAY,
+) -> list[PaymentResult]:
+    check_credentials(credentials, REQUIRED_CREDENTIALS)
+    return gateway.charge_batch(get_payment_method(), credentials, payments)
+
+
+async def process_payments_async(
+    credentials: Credentials,
+    payments: list[Payment],
+    gateway: Gateway = LOCAL_GATEWAY,
+) -> list[PaymentResult]:
+    check_credentials(credentials, REQUIRED_CREDENTIALS)
+    return await gateway.charge_batch_async(get_payment_method(), credentials, payments)
+
+
 def process_payment(total: Decimal) -> None:
+    """Interactive checkout: asks for the credentials and pays a single total."""
     card_number = input("Please enter your credit card number: ")
     expiration_date = input("Please enter your credit card expiration date: ")
     ccv = input("Please enter your credit card CCV: ")
@@ -14,3 +46,9 @@ def process_payment(total: Decimal) -> None:
     print(
         f"Processing credit card payment of ${total:.2f} with card number {card_number_masked} and expiration date {expiration_date} and CCV {ccv_masked}..."
     )
+    credentials = {
+        "card_number": card_number,
+        "expiration_date": expiration_date,
+        "ccv": ccv,
+    }
+    check_results(process_payments(credentials, [(CHECKOUT_CART_ID, total)]))
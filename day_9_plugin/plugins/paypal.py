@@ -1,14 +1,48 @@
 from decimal import Decimal
 
+from gateway import (
+    CHECKOUT_CART_ID,
+    LOCAL_GATEWAY,
+    Credentials,
+    Gateway,
+    Payment,
+    PaymentResult,
+    check_credentials,
+    check_results,
+)
+
+REQUIRED_CREDENTIALS = ("username", "password")
+
 
 def get_payment_method() -> str:
     return "paypal"
 
 
+def process_payments(
+    credentials: Credentials,
+    payments: list[Payment],
+    gateway: Gateway = LOCAL_GATEWAY,
+) -> list[PaymentResult]:
+    check_credentials(credentials, REQUIRED_CREDENTIALS)
+    return gateway.charge_batch(get_payment_method(), credentials, payments)
+
+
+async def process_payments_async(
+    credentials: Credentials,
+    payments: list[Payment],
+    gateway: Gateway = LOCAL_GATEWAY,
+) -> list[PaymentResult]:
+    check_credentials(credentials, REQUIRED_CREDENTIALS)
+    return await gateway.charge_batch_async(get_payment_method(), credentials, payments)
+
+
 def process_payment(total: Decimal) -> None:
+    """Interactive checkout: asks for the credentials and pays a single total."""
     username = input("Please enter your PayPal username: ")
     password = input("Please enter your PayPal password: ")
     password_masked = len(password) * "*"
     print(
         f"Processing PayPal payment of ${total:.2f} with username {username} and password {password_masked}..."
     )
+    credentials = {"username": username, "password": password}
+    check_results(process_payments(credentials, [(CHECKOUT_CART_ID, total)]))
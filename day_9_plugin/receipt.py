@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+import sys
+from json.encoder import encode_basestring_ascii as encode_string
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Protocol,
+    Sequence,
+    TextIO,
+)
+
+WRITE_BATCH_SIZE = 10_000  # lines per write when streaming to a file
+
+
+class ReceiptItem(Protocol):
+    @property
+    def name(self) -> str:
+        ...
+
+    @property
+    def price(self) -> Any:  # Money or Decimal
+        ...
+
+    @property
+    def quantity(self) -> int:
+        ...
+
+
+Summary = Sequence[tuple[str, Any]]  # labeled totals, like [("Total", total)]
+
+
+# Below this many cents, cents / 100 as a float is close enough to the exact
+# amount that formatting it with two decimals gives the exact digits.
+MAX_FLOAT_CENTS = 10**13
+
+
+def format_cents(cents: int) -> str:
+    if -MAX_FLOAT_CENTS < cents < MAX_FLOAT_CENTS:
+        return f"{cents / 100:.2f}"
+    units, remainder = divmod(abs(cents), 100)
+    return f"{'-' if cents < 0 else ''}{units}.{remainder:02}"
+
+
+def line_amounts(price: Any, quantity: int) -> tuple[str, str]:
+    """Formats the price and line total with two decimals.
+
+    Money amounts in cents are formatted from their integer minor units, which is
+    several times faster than formatting them as decimals.
+    """
+    if getattr(price, "places", None) == 2:
+        cents = price.minor_units
+        return format_cents(cents), format_cents(cents * quantity)
+    return f"{price:.2f}", f"{price * quantity:.2f}"
+
+
+def text_chunks(
+    items: Iterable[ReceiptItem], summary: Summary, amount_width: int = 7
+) -> Iterator[str]:
+    yield "Shopping Cart:\n"
+    yield f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}\n"
+    for item in items:
+        price, total = line_amounts(item.price, item.quantity)
+        yield f"{item.name:<12}${price:>7}{item.quantity:>7}     ${total:>7}\n"
+    yield "=" * 40 + "\n"
+    label_width = max(len(label) for label, _ in summary) + 2
+    for label, amount in summary:
+        yield f"{label + ':':<{label_width}}${amount:>{amount_width}.2f}\n"
+
+
+def csv_chunks(items: Iterable[ReceiptItem], summary: Summary) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(("name", "price", "quantity", "total"))
+    for item in items:
+        price, total = line_amounts(item.price, item.quantity)
+        writer.writerow((item.name, price, item.quantity, total))
+        if buffer.tell() > 1 << 16:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    for label, amount in summary:
+        writer.writerow((label, "", "", f"{amount:.2f}"))
+    yield buffer.getvalue()
+
+
+def json_chunks(items: Iterable[ReceiptItem], summary: Summary) -> Iterator[str]:
+    # Amounts are strings, so they stay exact. Lines are formatted directly rather
+    # than through json.dumps, only the names need escaping.
+    separator = '{"items": [\n'
+    for item in items:
+        price, total = line_amounts(item.price, item.quantity)
+        yield (
+            f'{separator}{{"name": {encode_string(item.name)}, "price": "{price}", '
+            f'"quantity": {item.quantity}, "total": "{total}"}}'
+        )
+        separator = ",\n"
+    if separator != ",\n":  # no items
+        yield separator.rstrip("\n")
+    totals = {label.lower(): f"{amount:.2f}" for label, amount in summary}
+    yield f"\n], \"summary\": {json.dumps(totals)}}}\n"
+
+
+FORMATS: dict[str, Callable[..., Iterator[str]]] = {
+    "text": text_chunks,
+    "csv": csv_chunks,
+    "json": json_chunks,
+}
+
+
+def render_receipt(
+    items: Iterable[ReceiptItem],
+    summary: Summary,
+    format: str = "text",  # pylint: disable=redefined-builtin
+    out: Optional[TextIO] = None,
+    **options: Any,
+) -> Optional[str]:
+    """Renders a receipt in the given format.
+
+    Without out, the receipt is built in one buffer and returned. With out, it's
+    streamed to the file in batches of lines and nothing is returned.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown receipt format: {format}")
+    chunks = FORMATS[format](items, summary, **options)
+    if out is None:
+        return "".join(chunks)
+    batch: list[str] = []
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) == WRITE_BATCH_SIZE:
+            out.write("".join(batch))
+            batch = []
+    out.write("".join(batch))
+    return None
+
+
+def print_receipt(
+    items: Iterable[ReceiptItem], summary: Summary, **options: Any
+) -> None:
+    render_receipt(items, summary, out=sys.stdout, **options)